@@ -15,6 +15,10 @@ from config import settings
 from models import Tweet
 from ai_router import ai_router
 
+# Shared decoder - raw_decode handles nested objects the AI may return
+_JSON_DECODER = json.JSONDecoder()
+_SCORE_RE = re.compile(r'(\d+)')
+
 
 class AIAnalyzerError(Exception):
     """AI analysis error."""
@@ -122,10 +126,10 @@ Respond in JSON format:
     def _parse_response(self, content: str, tweet: Tweet) -> TweetRating:
         """Parse AI response into TweetRating."""
         try:
-            # Extract JSON from response
-            json_match = re.search(r'\{[^}]+\}', content, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group())
+            # Extract JSON from response (first object, nested braces OK)
+            start = content.find("{")
+            if start != -1:
+                data, _end = _JSON_DECODER.raw_decode(content, start)
             else:
                 data = json.loads(content)
             
@@ -140,7 +144,7 @@ Respond in JSON format:
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse AI response: {e}")
             # Fallback: try to extract score from text
-            score_match = re.search(r'(\d+)', content)
+            score_match = _SCORE_RE.search(content)
             score = int(score_match.group(1)) if score_match else 5
             
             return TweetRating(
@@ -56,15 +56,17 @@ class AIScheduler:
             logger.debug(f"Processing user: @{user.username}")
             
             try:
-                # Fetch tweets
-                tweets = await twitter.get_last_tweets(user.username)
+                # Fetch tweets (only new ones get fully parsed); the stored id is
+                # validated once here so a bad value can't fail every poll
+                since_id = self._since_id(user)
+                tweets = await twitter.get_last_tweets(user.username, since_id=since_id)
                 
                 if not tweets:
                     logger.debug(f"No tweets found for @{user.username}")
                     return
                 
-                # Handle new user (no last_tweet_id)
-                if user.last_tweet_id is None:
+                # Handle new user (no usable last_tweet_id - this also re-initializes a malformed one)
+                if since_id is None:
                     await self._handle_new_user(user, tweets)
                     return
                 
@@ -85,6 +87,17 @@ class AIScheduler:
             except Exception as e:
                 logger.error(f"Error processing @{user.username}: {e}")
     
+    @staticmethod
+    def _since_id(user: UserWithChannel) -> Optional[int]:
+        """user.last_tweet_id as an int, or None (with a warning) if it isn't numeric."""
+        if user.last_tweet_id is None:
+            return None
+        try:
+            return int(user.last_tweet_id)
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring malformed last_tweet_id {user.last_tweet_id!r} for @{user.username}")
+            return None
+    
     async def _handle_new_user(
         self,
         user: UserWithChannel,
@@ -106,7 +119,7 @@ class AIScheduler:
         analyzer: Optional[AIAnalyzer] = None
     ) -> None:
         """Handle existing user with AI-powered routing."""
-        # Filter tweets newer than last_tweet_id
+        # Filter tweets newer than last_tweet_id (already validated by _since_id)
         last_id = int(user.last_tweet_id)
         new_tweets = [t for t in tweets if int(t.id) > last_id]
         
@@ -73,6 +73,14 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Failed to initialize database: {e}")
         raise
     
+    # Shared Discord session for WhatsApp/Telegram replies
+    from discord_client import discord_client
+    await discord_client.startup()
+    
+    # Expire unanswered WhatsApp tweets in the background
+    from whatsapp_handler import flush_user_actions, whatsapp_handler
+    await whatsapp_handler.start()
+    
     # Auto-start scheduler on boot (Render free tier fix)
     try:
         if not scheduler or not scheduler.running:
@@ -90,6 +98,20 @@ async def lifespan(app: FastAPI):
     if scheduler and scheduler.running:
         scheduler.stop()
         logger.info("Scheduler stopped")
+    
+    from telegram_bot import telegram_bot
+    await telegram_bot.save_counters()
+    
+    # WhatsApp action tasks may still post to Discord and queue user_actions, so
+    # drain them (bounded; overruns are cancelled and re-queued) and flush the
+    # queue before closing the sessions they use
+    await whatsapp_handler.shutdown()
+    await flush_user_actions()
+    
+    await discord_client.shutdown()
+    
+    from http_pool import close_client
+    await close_client()
 
 
 app = FastAPI(title="Twitter Monitor Bot API", lifespan=lifespan)
@@ -638,7 +660,7 @@ async def telegram_webhook(request: dict):
             logger.info(f"Telegram message from {chat_id}: {text}")
             
             # Check if we're awaiting requirements for any build (from DATABASE)
-            awaiting_builds = db.get_awaiting_builds(str(chat_id))
+            awaiting_builds = await db.get_awaiting_builds(str(chat_id))
             awaiting = awaiting_builds[0]['alert_id'] if awaiting_builds else None
             
             if awaiting:
@@ -696,12 +718,16 @@ async def twilio_whatsapp_webhook(
     
     logger.info(f"WhatsApp reply from {From}: {Body}")
     
-    # Process the reply
-    response_message = await whatsapp_handler.process_reply(From, Body)
+    # ACK right away (Twilio retries slow webhooks) - the action runs in the background
+    response_message = await whatsapp_handler.enqueue_reply(From, Body, message_id=MessageSid)
     
-    # Return TwiML response (XML)
+    # Return TwiML response (XML) - empty for redelivered messages
     from fastapi.responses import PlainTextResponse
-    twiml = f"""<?xml version="1.0" encoding="UTF-8"?>
+    if not response_message:
+        twiml = """<?xml version="1.0" encoding="UTF-8"?>
+<Response/>"""
+    else:
+        twiml = f"""<?xml version="1.0" encoding="UTF-8"?>
 <Response>
     <Message>{response_message}</Message>
 </Response>"""
@@ -713,13 +739,16 @@ async def twilio_whatsapp_webhook(
 async def get_pending_tweets():
     """Get list of pending tweets awaiting user action."""
     from telegram_bot import telegram_bot
+    from whatsapp_handler import whatsapp_handler
     
     # Get Telegram pending
     telegram_pending = telegram_bot.get_pending_list()
     
     return {
         "pending_count": len(telegram_pending),
-        "telegram_pending": telegram_pending
+        "telegram_pending": telegram_pending,
+        "whatsapp_pending_count": whatsapp_handler.get_pending_count(),
+        "whatsapp_evicted_count": whatsapp_handler.evicted_count
     }
 
 
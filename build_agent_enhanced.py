@@ -23,9 +23,11 @@ import json
 import os
 import re
 import subprocess
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple
 from enum import Enum
 
 import httpx
@@ -136,6 +138,10 @@ class EnhancedBuildAgent:
     - CI/CD pipeline creation
     """
     
+    # Retried BUILDs of the same tweet skip the two LLM planning stages
+    PLAN_CACHE_TTL = 900  # seconds
+    PLAN_CACHE_MAX = 64
+    
     def __init__(self):
         # Use AI Router for BEST model selection (Qwen for code - cheap + excellent!)
         self.ai_router = ai_router
@@ -145,6 +151,9 @@ class EnhancedBuildAgent:
         self.projects_dir = "./projects"
         os.makedirs(self.projects_dir, exist_ok=True)
         
+        # (username, tweet_text) -> (cached_at, requirements, plan), oldest first
+        self._plan_cache: "OrderedDict[Tuple[str, str], Tuple[float, ProjectRequirements, ProjectPlan]]" = OrderedDict()
+        
         logger.info(f"BuildAgent initialized - DeepSeek for standard builds, MiniMax M2.5 for complex builds")
     
     def _select_code_task_type(self, plan: ProjectPlan) -> str:
@@ -539,7 +548,7 @@ Features: {', '.join(requirements.core_features)}
 Project Type: {project_type}
 
 Recommended Stack from Vercel AI SDK:
-{json.dumps(stack, indent=2)}
+{json.dumps(dict(stack), indent=2)}
 
 Vercel AI SDK Patterns to apply:
 {VercelAISkill.STREAMING_PATTERNS}
@@ -1607,10 +1616,16 @@ Built with 🤖 Enhanced Build Agent
     # MAIN BUILD ORCHESTRATION
     # ═══════════════════════════════════════════════════════════════
     
-    async def build_project(self, tweet_text: str, username: str) -> Dict[str, Any]:
+    async def build_project(
+        self,
+        tweet_text: str,
+        username: str,
+        on_progress: Optional[Callable[[str, str], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
         """
         Execute full 6-stage build pipeline.
         
+        on_progress(stage, message) is awaited as each stage starts.
         Returns build result with repo URL or error.
         """
         logger.info(f"🏗️ Starting full build pipeline for @{username}")
@@ -1622,22 +1637,32 @@ Built with 🤖 Enhanced Build Agent
         logger.info("\n" + "="*60)
         logger.info("STAGE 1/6: ANALYZE")
         logger.info("="*60)
-        requirements = await self.analyze_tweet(tweet_text, username)
-        if not requirements:
-            return {"success": False, "error": "Could not extract buildable requirements from tweet"}
+        await self._report_progress(on_progress, "analyze", "1/6 🧠 Analyzing tweet...")
+        cached = self._get_cached_plan(username, tweet_text)
+        if cached:
+            requirements, plan = cached
+            logger.info(f"♻️ Reusing analysis + plan for {requirements.name}")
+        else:
+            requirements = await self.analyze_tweet(tweet_text, username)
+            if not requirements:
+                return {"success": False, "error": "Could not extract buildable requirements from tweet"}
         build_log.append(f"✅ Analyzed: {requirements.name}")
         
         # Stage 2: PLAN
         logger.info("\n" + "="*60)
         logger.info("STAGE 2/6: PLAN")
         logger.info("="*60)
-        plan = await self.create_architecture_plan(requirements)
+        await self._report_progress(on_progress, "plan", "2/6 📐 Planning architecture...")
+        if not cached:
+            plan = await self.create_architecture_plan(requirements)
+            self._cache_plan(username, tweet_text, requirements, plan)
         build_log.append(f"✅ Planned: {plan.tech_stack.language} + {plan.tech_stack.framework}")
         
         # Stage 3: DESIGN
         logger.info("\n" + "="*60)
         logger.info("STAGE 3/6: DESIGN")
         logger.info("="*60)
+        await self._report_progress(on_progress, "design", "3/6 📝 Writing design docs...")
         docs = await self.create_design_docs(plan)
         build_log.append(f"✅ Designed: {len(docs)} documentation files")
         
@@ -1645,6 +1670,7 @@ Built with 🤖 Enhanced Build Agent
         logger.info("\n" + "="*60)
         logger.info("STAGE 4/6: IMPLEMENT")
         logger.info("="*60)
+        await self._report_progress(on_progress, "implement", "4/6 💻 Generating code + tests...")
         all_files = []
         for component in plan.components[:3]:  # Limit to 3 components for speed
             files = await self.generate_code(plan, component)
@@ -1655,6 +1681,7 @@ Built with 🤖 Enhanced Build Agent
         logger.info("\n" + "="*60)
         logger.info("STAGE 5/6: REVIEW")
         logger.info("="*60)
+        await self._report_progress(on_progress, "review", "5/6 🔍 Reviewing code...")
         review = await self.review_code(all_files, plan)
         build_log.append(f"✅ Reviewed: Score {review.score}/10, Passed: {review.passed}")
         
@@ -1668,6 +1695,7 @@ Built with 🤖 Enhanced Build Agent
         logger.info("\n" + "="*60)
         logger.info("STAGE 6/6: DEPLOY")
         logger.info("="*60)
+        await self._report_progress(on_progress, "deploy", "6/6 🚀 Creating repo + CI/CD...")
         cicd_files = await self.generate_cicd_files(plan)
         ai_sdk_files = await self.generate_ai_sdk_files(plan)
         build_log.append(f"✅ Deploy config: {len(cicd_files) + len(ai_sdk_files)} CI/CD files")
@@ -1723,6 +1751,39 @@ Built with 🤖 Enhanced Build Agent
             ]
         }
     
+    def _get_cached_plan(self, username: str, tweet_text: str) -> Optional[Tuple[ProjectRequirements, ProjectPlan]]:
+        """Requirements + plan from a recent build of the same tweet, if still fresh."""
+        entry = self._plan_cache.get((username, tweet_text))
+        if entry is None or time.monotonic() - entry[0] > self.PLAN_CACHE_TTL:
+            return None
+        return entry[1], entry[2]
+    
+    def _cache_plan(self, username: str, tweet_text: str, requirements: ProjectRequirements, plan: ProjectPlan) -> None:
+        """Remember stages 1-2, dropping expired entries (oldest first) and capping the size."""
+        now = time.monotonic()
+        self._plan_cache[(username, tweet_text)] = (now, requirements, plan)
+        self._plan_cache.move_to_end((username, tweet_text))
+        
+        while self._plan_cache:
+            oldest = next(iter(self._plan_cache.values()))
+            if len(self._plan_cache) <= self.PLAN_CACHE_MAX and now - oldest[0] <= self.PLAN_CACHE_TTL:
+                break
+            self._plan_cache.popitem(last=False)
+    
+    async def _report_progress(
+        self,
+        on_progress: Optional[Callable[[str, str], Awaitable[None]]],
+        stage: str,
+        message: str
+    ) -> None:
+        """Tell the caller a stage started - a failing callback never stops the build."""
+        if on_progress is None:
+            return
+        try:
+            await on_progress(stage, message)
+        except Exception as e:
+            logger.warning(f"Progress callback failed at {stage}: {e}")
+    
     async def _create_local_project(
         self,
         plan: ProjectPlan,
@@ -2,6 +2,8 @@
 
 import os
 import asyncio
+import json
+import time
 from typing import Optional, List, Dict, Any
 from contextlib import contextmanager
 from datetime import datetime
@@ -107,6 +109,57 @@ class Database:
                 )
             """)
             
+            # counters table (alert IDs like AI-001 must survive restarts)
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            
+            # user_actions table (WhatsApp reply tracking)
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS user_actions (
+                    id SERIAL PRIMARY KEY,
+                    phone TEXT NOT NULL,
+                    action TEXT NOT NULL,
+                    username TEXT,
+                    tweet_id TEXT,
+                    tweet_text TEXT,
+                    ai_score INTEGER,
+                    project_name TEXT,
+                    reason TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # build_cache table (BUILD results keyed by normalized tweet text hash)
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS build_cache (
+                    text_hash TEXT PRIMARY KEY,
+                    result_json TEXT NOT NULL,
+                    cached_at DOUBLE PRECISION NOT NULL
+                )
+            """)
+            
+            # pending_builds table (Telegram BUILDs awaiting requirements - survives restarts)
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS pending_builds (
+                    id SERIAL PRIMARY KEY,
+                    alert_id TEXT UNIQUE NOT NULL,
+                    username TEXT NOT NULL,
+                    tweet_text TEXT NOT NULL,
+                    score INTEGER,
+                    category TEXT,
+                    reason TEXT,
+                    chat_id TEXT NOT NULL,
+                    status TEXT DEFAULT 'awaiting_requirements',
+                    user_requirements TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
             logger.info("PostgreSQL tables created")
     
     async def _create_sqlite_tables(self):
@@ -153,6 +206,45 @@ class Database:
                     reason TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 );
+                
+                CREATE TABLE IF NOT EXISTS counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL DEFAULT 0
+                );
+                
+                CREATE TABLE IF NOT EXISTS user_actions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    phone TEXT NOT NULL,
+                    action TEXT NOT NULL,
+                    username TEXT,
+                    tweet_id TEXT,
+                    tweet_text TEXT,
+                    ai_score INTEGER,
+                    project_name TEXT,
+                    reason TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                
+                CREATE TABLE IF NOT EXISTS build_cache (
+                    text_hash TEXT PRIMARY KEY,
+                    result_json TEXT NOT NULL,
+                    cached_at REAL NOT NULL
+                );
+                
+                CREATE TABLE IF NOT EXISTS pending_builds (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    alert_id TEXT UNIQUE NOT NULL,
+                    username TEXT NOT NULL,
+                    tweet_text TEXT NOT NULL,
+                    score INTEGER,
+                    category TEXT,
+                    reason TEXT,
+                    chat_id TEXT NOT NULL,
+                    status TEXT DEFAULT 'awaiting_requirements',
+                    user_requirements TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
             """)
             await conn.commit()
             logger.info("SQLite tables created")
@@ -251,6 +343,162 @@ class Database:
         """Alias for update_user_last_tweet."""
         await self.update_user_last_tweet(username, tweet_id)
     
+    async def increment_counter(self, name: str) -> int:
+        """Atomically increment a named counter and return the new value."""
+        if self.is_postgres:
+            async with self.pool.acquire() as conn:
+                return await conn.fetchval(
+                    """INSERT INTO counters (name, value) VALUES ($1, 1)
+                       ON CONFLICT (name) DO UPDATE SET value = counters.value + 1
+                       RETURNING value""",
+                    name
+                )
+        else:
+            import aiosqlite
+            async with aiosqlite.connect(self.db_path) as conn:
+                async with conn.execute(
+                    """INSERT INTO counters (name, value) VALUES (?, 1)
+                       ON CONFLICT (name) DO UPDATE SET value = counters.value + 1
+                       RETURNING value""",
+                    (name,)
+                ) as cursor:
+                    row = await cursor.fetchone()
+                await conn.commit()
+                return row[0]
+    
+    async def save_counter(self, name: str, value: int):
+        """Store a counter snapshot, never moving it backwards."""
+        await self.execute(
+            """INSERT INTO counters (name, value) VALUES ($1, $2)
+               ON CONFLICT (name) DO UPDATE SET value = GREATEST(counters.value, EXCLUDED.value)"""
+            if self.is_postgres else
+            """INSERT INTO counters (name, value) VALUES (?, ?)
+               ON CONFLICT (name) DO UPDATE SET value = MAX(counters.value, excluded.value)""",
+            name, value
+        )
+    
+    async def log_user_actions_bulk(self, rows: List[Dict]):
+        """Insert a batch of user actions (WhatsApp replies) with multi-row INSERTs."""
+        if not rows:
+            return
+        columns = ("phone", "action", "username", "tweet_id", "tweet_text",
+                   "ai_score", "project_name", "reason")
+        width = len(columns)
+        chunk_rows = 100  # 800 parameters - under SQLite's default limit of 999
+        
+        for start in range(0, len(rows), chunk_rows):
+            chunk = rows[start:start + chunk_rows]
+            if self.is_postgres:
+                groups = ", ".join(
+                    "(" + ", ".join(f"${i * width + j + 1}" for j in range(width)) + ")"
+                    for i in range(len(chunk))
+                )
+            else:
+                groups = ", ".join(["(" + ", ".join("?" * width) + ")"] * len(chunk))
+            await self.execute(
+                f"INSERT INTO user_actions ({', '.join(columns)}) VALUES {groups}",
+                *(row.get(col) for row in chunk for col in columns)
+            )
+    
+    async def create_pending_build(
+        self,
+        alert_id: str,
+        username: str,
+        tweet_text: str,
+        score: int,
+        category: str,
+        reason: str,
+        chat_id: str
+    ):
+        """Store (or reset) a BUILD that is awaiting user requirements."""
+        await self.execute(
+            """INSERT INTO pending_builds 
+               (alert_id, username, tweet_text, score, category, reason, chat_id, status)
+               VALUES ($1, $2, $3, $4, $5, $6, $7, 'awaiting_requirements')
+               ON CONFLICT (alert_id) DO UPDATE SET
+                   username = EXCLUDED.username, tweet_text = EXCLUDED.tweet_text,
+                   score = EXCLUDED.score, category = EXCLUDED.category,
+                   reason = EXCLUDED.reason, chat_id = EXCLUDED.chat_id,
+                   status = 'awaiting_requirements', user_requirements = NULL,
+                   updated_at = CURRENT_TIMESTAMP"""
+            if self.is_postgres else
+            """INSERT INTO pending_builds 
+               (alert_id, username, tweet_text, score, category, reason, chat_id, status)
+               VALUES (?, ?, ?, ?, ?, ?, ?, 'awaiting_requirements')
+               ON CONFLICT (alert_id) DO UPDATE SET
+                   username = excluded.username, tweet_text = excluded.tweet_text,
+                   score = excluded.score, category = excluded.category,
+                   reason = excluded.reason, chat_id = excluded.chat_id,
+                   status = 'awaiting_requirements', user_requirements = NULL,
+                   updated_at = CURRENT_TIMESTAMP""",
+            alert_id, username, tweet_text, score, category, reason, chat_id
+        )
+    
+    async def get_pending_build(self, alert_id: str) -> Optional[Dict]:
+        """Get a BUILD still awaiting requirements by alert_id."""
+        return await self.fetchone(
+            "SELECT * FROM pending_builds WHERE alert_id = $1 AND status = 'awaiting_requirements'"
+            if self.is_postgres else
+            "SELECT * FROM pending_builds WHERE alert_id = ? AND status = 'awaiting_requirements'",
+            alert_id
+        )
+    
+    async def get_awaiting_builds(self, chat_id: str) -> List[Dict]:
+        """Get all BUILDs awaiting requirements for a chat (newest first)."""
+        return await self.fetchall(
+            """SELECT * FROM pending_builds 
+               WHERE chat_id = $1 AND status = 'awaiting_requirements'
+               ORDER BY created_at DESC, id DESC"""
+            if self.is_postgres else
+            """SELECT * FROM pending_builds 
+               WHERE chat_id = ? AND status = 'awaiting_requirements'
+               ORDER BY created_at DESC, id DESC""",
+            chat_id
+        )
+    
+    async def update_build_requirements(self, alert_id: str, requirements: str):
+        """Store the user's requirements and mark the BUILD as building."""
+        await self.execute(
+            """UPDATE pending_builds 
+               SET user_requirements = $1, status = 'building', updated_at = CURRENT_TIMESTAMP
+               WHERE alert_id = $2"""
+            if self.is_postgres else
+            """UPDATE pending_builds 
+               SET user_requirements = ?, status = 'building', updated_at = CURRENT_TIMESTAMP
+               WHERE alert_id = ?""",
+            requirements, alert_id
+        )
+    
+    async def mark_build_completed(self, alert_id: str, success: bool = True):
+        """Mark a BUILD as completed or failed."""
+        await self.execute(
+            "UPDATE pending_builds SET status = $1, updated_at = CURRENT_TIMESTAMP WHERE alert_id = $2"
+            if self.is_postgres else
+            "UPDATE pending_builds SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE alert_id = ?",
+            "completed" if success else "failed", alert_id
+        )
+    
+    async def get_cached_build(self, text_hash: str, max_age: float) -> Optional[Dict]:
+        """Get a cached build result no older than max_age seconds."""
+        row = await self.fetchone(
+            "SELECT result_json FROM build_cache WHERE text_hash = $1 AND cached_at >= $2"
+            if self.is_postgres else
+            "SELECT result_json FROM build_cache WHERE text_hash = ? AND cached_at >= ?",
+            text_hash, time.time() - max_age
+        )
+        return json.loads(row["result_json"]) if row else None
+    
+    async def save_cached_build(self, text_hash: str, result: Dict):
+        """Store (or refresh) a build result."""
+        await self.execute(
+            """INSERT INTO build_cache (text_hash, result_json, cached_at) VALUES ($1, $2, $3)
+               ON CONFLICT (text_hash) DO UPDATE SET result_json = EXCLUDED.result_json, cached_at = EXCLUDED.cached_at"""
+            if self.is_postgres else
+            """INSERT INTO build_cache (text_hash, result_json, cached_at) VALUES (?, ?, ?)
+               ON CONFLICT (text_hash) DO UPDATE SET result_json = excluded.result_json, cached_at = excluded.cached_at""",
+            text_hash, json.dumps(result, default=str), time.time()
+        )
+    
     async def set_user_inactive(self, username: str):
         """Set user as inactive."""
         await self.execute(
@@ -1,6 +1,7 @@
 """Discord webhook client for sending tweets."""
 
 import asyncio
+import random
 from datetime import datetime
 from typing import Optional
 
@@ -8,7 +9,9 @@ import httpx
 from loguru import logger
 
 from config import settings
+from http_pool import POOL_LIMITS, dumps_json
 from models import Tweet
+from text_utils import truncate
 
 
 class DiscordWebhookError(Exception):
@@ -22,13 +25,30 @@ class DiscordClient:
     MAX_TEXT_LENGTH = 3900  # Discord limit is 4096, leave room for formatting
     AVATAR_URL = "https://abs.twimg.com/icons/apple-touch-icon-192x192.png"
     BOT_USERNAME = "Twitter Monitor"
+    BACKOFF_JITTER = 0.5  # Up to +50% random spread so retries don't line up
+    BACKOFF_MAX = 8.0  # Seconds
     
     def __init__(self):
-        self.client = httpx.AsyncClient(
+        self.client = self._new_client()
+    
+    @staticmethod
+    def _new_client() -> httpx.AsyncClient:
+        # Same keep-alive pool sizing as the shared client - replies reuse warm connections
+        return httpx.AsyncClient(
+            limits=POOL_LIMITS,
             timeout=httpx.Timeout(settings.DISCORD_TIMEOUT),
             headers={"Content-Type": "application/json"}
         )
     
+    async def startup(self) -> None:
+        """Open the long-lived session (call once from the app lifespan)."""
+        if self.client.is_closed:
+            self.client = self._new_client()
+    
+    async def shutdown(self) -> None:
+        """Close the long-lived session on app shutdown."""
+        await self.client.aclose()
+    
     async def __aenter__(self):
         return self
     
@@ -51,15 +71,34 @@ class DiscordClient:
         
         return f"❤️ {likes} | 🔁 {retweets} | 💬 {replies}"
     
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff from DISCORD_RETRY_DELAY with jitter, capped at BACKOFF_MAX."""
+        delay = settings.DISCORD_RETRY_DELAY * 2 ** attempt * (1 + random.random() * self.BACKOFF_JITTER)
+        return min(self.BACKOFF_MAX, delay)
+    
+    @staticmethod
+    def _retry_after(response: httpx.Response, default: float) -> float:
+        """Seconds Discord asks us to wait (header or JSON body; may be fractional)."""
+        value = response.headers.get("Retry-After")
+        if value is None:
+            # 429s from the CDN/proxy can be HTML or a bare JSON value
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            value = body.get("retry_after") if isinstance(body, dict) else None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return default
+    
     def _format_timestamp(self, dt: datetime) -> str:
         """Format datetime for Discord timestamp."""
         return dt.strftime("%Y-%m-%dT%H:%M:%S.000Z")
     
     def _truncate_text(self, text: str) -> str:
         """Truncate text to Discord's limit."""
-        if len(text) <= self.MAX_TEXT_LENGTH:
-            return text
-        return text[:self.MAX_TEXT_LENGTH-3] + "..."
+        return truncate(text, self.MAX_TEXT_LENGTH)
     
     def _build_payload(self, username: str, tweet: Tweet, note: str = None) -> dict:
         """Build Discord webhook payload."""
@@ -113,11 +152,11 @@ class DiscordClient:
         Returns True if sent successfully, False otherwise.
         Raises DiscordWebhookError with 404 status for invalid webhooks.
         """
-        payload = self._build_payload(username, tweet, note)
+        body = dumps_json(self._build_payload(username, tweet, note))
         
         for attempt in range(settings.DISCORD_RETRY_ATTEMPTS):
             try:
-                response = await self.client.post(webhook_url, json=payload)
+                response = await self.client.post(webhook_url, content=body)
                 
                 if response.status_code == 204:
                     logger.info(f"Discord notification sent for @{username}")
@@ -131,11 +170,14 @@ class DiscordClient:
                     )
                 
                 elif response.status_code == 429:
-                    # Rate limited
-                    retry_after = int(response.headers.get('Retry-After', 5))
-                    logger.warning(f"Discord rate limited, waiting {retry_after}s...")
-                    await asyncio.sleep(retry_after)
-                    continue
+                    # Rate limited - honour Discord's wait (it can be fractional)
+                    if attempt < settings.DISCORD_RETRY_ATTEMPTS - 1:
+                        retry_after = self._retry_after(response, self._backoff_delay(attempt))
+                        logger.warning(f"Discord rate limited, waiting {retry_after:.1f}s...")
+                        await asyncio.sleep(retry_after)
+                        continue
+                    logger.error("Discord rate limited after all retries")
+                    return False
                 
                 elif 500 <= response.status_code < 600:
                     # Server error, retry
@@ -143,7 +185,7 @@ class DiscordClient:
                         logger.warning(
                             f"Discord server error {response.status_code}, retrying..."
                         )
-                        await asyncio.sleep(settings.DISCORD_RETRY_DELAY)
+                        await asyncio.sleep(self._backoff_delay(attempt))
                         continue
                     else:
                         logger.error(
@@ -160,7 +202,7 @@ class DiscordClient:
             except httpx.TimeoutException:
                 if attempt < settings.DISCORD_RETRY_ATTEMPTS - 1:
                     logger.warning(f"Discord timeout, retrying...")
-                    await asyncio.sleep(settings.DISCORD_RETRY_DELAY)
+                    await asyncio.sleep(self._backoff_delay(attempt))
                     continue
                 logger.error("Discord webhook timeout after all retries")
                 return False
@@ -168,7 +210,7 @@ class DiscordClient:
             except httpx.RequestError as e:
                 if attempt < settings.DISCORD_RETRY_ATTEMPTS - 1:
                     logger.warning(f"Discord request error: {e}, retrying...")
-                    await asyncio.sleep(settings.DISCORD_RETRY_DELAY)
+                    await asyncio.sleep(self._backoff_delay(attempt))
                     continue
                 logger.error(f"Discord request error after all retries: {e}")
                 return False
@@ -215,7 +257,7 @@ class DiscordClient:
         }
         
         try:
-            response = await self.client.post(webhook_url, json=payload)
+            response = await self.client.post(webhook_url, content=dumps_json(payload))
             return response.status_code == 204
         except Exception as e:
             logger.error(f"Failed to send to INTERESTING channel: {e}")
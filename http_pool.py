@@ -0,0 +1,88 @@
+"""Shared HTTP connection pool for outbound API calls.
+
+Discord, Twilio, Telegram and TwitterAPI.io clients all reuse one
+httpx.AsyncClient so keep-alive connections (and TLS sessions) survive
+between sends instead of paying a new handshake per request.
+"""
+
+import asyncio
+import json
+from typing import Any, Optional
+
+import httpx
+from loguru import logger
+
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# orjson serializes nested payloads (Discord embeds) several times faster
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+POOL_LIMITS = httpx.Limits(
+    max_keepalive_connections=100,
+    max_connections=200,
+    keepalive_expiry=60
+)
+DEFAULT_TIMEOUT = httpx.Timeout(10, connect=5)
+
+# Pass with content=dumps_json(...) - not set on the client, Twilio posts are form-encoded
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialize a request body to JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get the shared AsyncClient (created on first use)."""
+    global _client, _client_loop
+    
+    loop = _running_loop()
+    
+    # Pooled connections belong to the loop that opened them - a new
+    # event loop (e.g. a second asyncio.run) needs its own client
+    stale_loop = loop is not None and _client_loop is not None and loop is not _client_loop
+    
+    if _client is None or _client.is_closed or stale_loop:
+        _client = httpx.AsyncClient(
+            limits=POOL_LIMITS,
+            timeout=DEFAULT_TIMEOUT,
+            http2=HTTP2_AVAILABLE
+        )
+        _client_loop = loop
+        logger.debug(f"Created shared HTTP client (http2={HTTP2_AVAILABLE})")
+    elif _client_loop is None:
+        _client_loop = loop
+    
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client (call on application shutdown)."""
+    global _client, _client_loop
+    
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
@@ -2,7 +2,8 @@
 """Sequential notification queue - one tweet at a time with user response time."""
 
 import asyncio
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 
@@ -38,7 +39,8 @@ class NotificationRateLimiter:
     MAX_QUEUE_SIZE = 20    # Max tweets to queue
     
     def __init__(self):
-        self.last_notification_time: Optional[datetime] = None
+        self.last_notification_time: Optional[datetime] = None  # Wall clock, for status display
+        self._last_sent_mono: Optional[float] = None  # time.monotonic(), for cooldown math
         self.queue: List[QueuedTweet] = []
         self._lock = asyncio.Lock()
         self._processing = False
@@ -46,11 +48,9 @@ class NotificationRateLimiter:
     async def should_send_notification(self, username: str, tweet_id: str) -> bool:
         """Check if we should send a notification now or queue it."""
         async with self._lock:
-            now = datetime.now()
-            
             # Check if in cooldown
-            if self.last_notification_time:
-                elapsed = (now - self.last_notification_time).total_seconds() / 60
+            if self._last_sent_mono is not None:
+                elapsed = (time.monotonic() - self._last_sent_mono) / 60
                 if elapsed < self.MIN_DELAY_MINUTES:
                     logger.info(
                         f"In delay period ({elapsed:.1f}min/{self.MIN_DELAY_MINUTES}min), "
@@ -121,6 +121,7 @@ class NotificationRateLimiter:
         """Mark that we just sent a notification."""
         async with self._lock:
             self.last_notification_time = datetime.now()
+            self._last_sent_mono = time.monotonic()
             logger.info(f"Notification sent, next one allowed in {self.MIN_DELAY_MINUTES}min")
     
     async def get_queue_status(self) -> dict:
@@ -149,10 +150,8 @@ class NotificationRateLimiter:
     
     def get_status(self) -> dict:
         """Get current rate limiter status."""
-        now = datetime.now()
-        
-        if self.last_notification_time:
-            elapsed = (now - self.last_notification_time).total_seconds() / 60
+        if self._last_sent_mono is not None:
+            elapsed = (time.monotonic() - self._last_sent_mono) / 60
             delay_remaining = max(0, self.MIN_DELAY_MINUTES - elapsed)
             in_delay = delay_remaining > 0
         else:
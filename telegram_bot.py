@@ -4,18 +4,36 @@ FREE alternative to WhatsApp ($0.04/msg).
 Handles urgent notifications and user replies.
 """
 
-import httpx
+import json
+import time
 from datetime import datetime
 from typing import Optional, Dict, Any
 from loguru import logger
 
 from config import settings
 from database import db
+from http_pool import JSON_HEADERS, dumps_json, get_client
+from text_utils import truncate
+
+# Urgent-alert keyboard, serialized once - only the alert_id changes per send
+_URGENT_KEYBOARD_JSON = json.dumps({
+    "inline_keyboard": [
+        [
+            {"text": "1️⃣ INTERESTING", "callback_data": "INTERESTING:%(alert_id)s"},
+            {"text": "2️⃣ NOTHING", "callback_data": "NOTHING:%(alert_id)s"},
+            {"text": "3️⃣ BUILD", "callback_data": "BUILD:%(alert_id)s"}
+        ]
+    ]
+})
+_URGENT_PAYLOAD_JSON = '{"chat_id":%s,"text":%s,"reply_markup":%s,"disable_web_page_preview":true}'
 
 
 class TelegramBot:
     """Telegram bot for urgent notifications."""
     
+    AWAITING_CACHE_TTL = 300  # seconds
+    AWAITING_CACHE_SIZE = 512
+    
     def __init__(self):
         self.token = settings.TELEGRAM_BOT_TOKEN
         self.chat_id = settings.TELEGRAM_CHAT_ID
@@ -26,24 +44,38 @@ class TelegramBot:
         self.pending_tweets: Dict[str, Dict] = {}
         
         # Note: awaiting_requirements now stored in DATABASE (survives restarts)
+        # Positive cache in front of it: alert_id -> expiry (monotonic seconds)
+        self._awaiting_cache: Dict[str, float] = {}
         
         # Counters for each category (AI-001, CRYPTO-005, etc.)
+        # DATABASE is the source of truth; these are the fallback + shutdown snapshot
         self.category_counters: Dict[str, int] = {}
-        self.global_counter = 0
     
-    def _generate_tweet_id(self, category: str) -> str:
+    async def _generate_tweet_id(self, category: str) -> str:
         """Generate unique ID like AI-001, CRYPTO-005, etc."""
         category = category.upper()[:10]  # Max 10 chars
         
-        # Increment counter for this category
-        if category not in self.category_counters:
-            self.category_counters[category] = 0
-        self.category_counters[category] += 1
+        # Increment counter for this category in DATABASE (atomic - survives restarts)
+        try:
+            n = await db.increment_counter(f"tg:cat:{category}")
+            self.category_counters[category] = max(n, self.category_counters.get(category, 0))
+        except Exception as e:
+            logger.warning(f"Counter DB increment failed, using memory: {e}")
+            # No await between read and write, so this can't interleave on the event loop
+            n = self.category_counters.get(category, 0) + 1
+            self.category_counters[category] = n
         
-        # Also global counter for uniqueness
-        self.global_counter += 1
+        return f"{category}-{n:03d}"
+    
+    async def save_counters(self):
+        """Snapshot counters to DATABASE (called on shutdown)."""
+        counters = dict(self.category_counters)
         
-        return f"{category}-{self.category_counters[category]:03d}"
+        try:
+            for category, value in counters.items():
+                await db.save_counter(f"tg:cat:{category}", value)
+        except Exception as e:
+            logger.error(f"Failed to save counters: {e}")
     
     async def send_urgent_tweet(
         self,
@@ -60,11 +92,11 @@ class TelegramBot:
             return {"sent": False, "error": "Telegram not configured"}
         
         # Generate unique ID for this alert
-        alert_id = self._generate_tweet_id(category)
+        alert_id = await self._generate_tweet_id(category)
         
         # Truncate tweet text
-        display_text = tweet_text[:280] + "..." if len(tweet_text) > 280 else tweet_text
-        reason_clean = reason[:60] + "..." if len(reason) > 60 else reason
+        display_text = truncate(tweet_text, 280)
+        reason_clean = truncate(reason, 60)
         
         message = f"""🚨 [{alert_id}] URGENT {score}/10
 
@@ -76,54 +108,44 @@ class TelegramBot:
 
 Choose action ⬇️"""
 
-        # Inline keyboard with action buttons
-        keyboard = {
-            "inline_keyboard": [
-                [
-                    {"text": "1️⃣ INTERESTING", "callback_data": f"INTERESTING:{alert_id}"},
-                    {"text": "2️⃣ NOTHING", "callback_data": f"NOTHING:{alert_id}"},
-                    {"text": "3️⃣ BUILD", "callback_data": f"BUILD:{alert_id}"}
-                ]
-            ]
-        }
+        # Inline keyboard with action buttons (pre-serialized template)
+        keyboard = _URGENT_KEYBOARD_JSON % {"alert_id": json.dumps(alert_id)[1:-1]}
+        payload = _URGENT_PAYLOAD_JSON % (json.dumps(self.chat_id), json.dumps(message), keyboard)
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/sendMessage",
-                    json={
-                        "chat_id": self.chat_id,
-                        "text": message,
-                        "reply_markup": keyboard,
-                        "disable_web_page_preview": True
-                    }
-                )
+            client = get_client()
+            response = await client.post(
+                f"{self.base_url}/sendMessage",
+                content=payload.encode(),
+                headers=JSON_HEADERS
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                sent_message_id = data["result"]["message_id"]
+                
+                # Store pending tweet with alert_id as key
+                self.pending_tweets[alert_id] = {
+                    "alert_id": alert_id,
+                    "username": username,
+                    "text": tweet_text,
+                    "text_short_200": truncate(tweet_text, 200),
+                    "score": score,
+                    "category": category,
+                    "reason": reason,
+                    "sent_at": datetime.now(),
+                    "telegram_message_id": sent_message_id,
+                    "status": "pending",
+                    "original_tweet_id": tweet_id
+                }
+                
+                logger.info(f"📨 Telegram sent [{alert_id}] for @{username}")
+                return {"sent": True, "alert_id": alert_id, "message_id": sent_message_id, "cost": "$0.00"}
+            else:
+                error = response.json().get("description", "Unknown error")
+                logger.error(f"Telegram send failed: {error}")
+                return {"sent": False, "error": error}
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    sent_message_id = data["result"]["message_id"]
-                    
-                    # Store pending tweet with alert_id as key
-                    self.pending_tweets[alert_id] = {
-                        "alert_id": alert_id,
-                        "username": username,
-                        "text": tweet_text,
-                        "score": score,
-                        "category": category,
-                        "reason": reason,
-                        "sent_at": datetime.now(),
-                        "telegram_message_id": sent_message_id,
-                        "status": "pending",
-                        "original_tweet_id": tweet_id
-                    }
-                    
-                    logger.info(f"📨 Telegram sent [{alert_id}] for @{username}")
-                    return {"sent": True, "alert_id": alert_id, "message_id": sent_message_id, "cost": "$0.00"}
-                else:
-                    error = response.json().get("description", "Unknown error")
-                    logger.error(f"Telegram send failed: {error}")
-                    return {"sent": False, "error": error}
-                    
         except Exception as e:
             logger.error(f"Telegram send error: {e}")
             return {"sent": False, "error": str(e)}
@@ -141,12 +163,13 @@ Choose action ⬇️"""
             if reply_markup:
                 payload["reply_markup"] = reply_markup
                 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/sendMessage",
-                    json=payload
-                )
-                return {"sent": response.status_code == 200}
+            client = get_client()
+            response = await client.post(
+                f"{self.base_url}/sendMessage",
+                content=dumps_json(payload),
+                headers=JSON_HEADERS
+            )
+            return {"sent": response.status_code == 200}
         except Exception as e:
             return {"sent": False, "error": str(e)}
     
@@ -156,14 +179,14 @@ Choose action ⬇️"""
             return
         
         try:
-            async with httpx.AsyncClient() as client:
-                await client.post(
-                    f"{self.base_url}/answerCallbackQuery",
-                    json={
-                        "callback_query_id": callback_id,
-                        "text": text[:200]  # Max 200 chars
-                    }
-                )
+            client = get_client()
+            await client.post(
+                f"{self.base_url}/answerCallbackQuery",
+                json={
+                    "callback_query_id": callback_id,
+                    "text": text[:200]  # Max 200 chars
+                }
+            )
         except Exception as e:
             logger.error(f"Failed to answer callback: {e}")
     
@@ -185,15 +208,15 @@ Choose action ⬇️"""
         text = f"{emoji} [{alert_id}] {action}\n\n{result.get('message', 'Done!')}"
         
         try:
-            async with httpx.AsyncClient() as client:
-                await client.post(
-                    f"{self.base_url}/editMessageText",
-                    json={
-                        "chat_id": chat_id,
-                        "message_id": message_id,
-                        "text": text
-                    }
-                )
+            client = get_client()
+            await client.post(
+                f"{self.base_url}/editMessageText",
+                json={
+                    "chat_id": chat_id,
+                    "message_id": message_id,
+                    "text": text
+                }
+            )
         except Exception as e:
             logger.error(f"Failed to update message: {e}")
     
@@ -204,7 +227,7 @@ Choose action ⬇️"""
         
         # Store in DATABASE (survives server restarts)
         try:
-            db.create_pending_build(
+            await db.create_pending_build(
                 alert_id=alert_id,
                 username=pending.get('username', 'unknown'),
                 tweet_text=pending.get('text', ''),
@@ -214,6 +237,7 @@ Choose action ⬇️"""
                 chat_id=str(chat_id)
             )
             logger.info(f"Stored pending build [{alert_id}] in database")
+            self._cache_awaiting(alert_id)
         except Exception as e:
             logger.error(f"Failed to store pending build: {e}")
         
@@ -221,7 +245,7 @@ Choose action ⬇️"""
         message = f"""🔨 BUILD: [{alert_id}]
 
 Original idea:
-💬 {pending.get('text', '')[:200]}...
+💬 {pending.get('text_short_200') or truncate(pending.get('text', ''), 200)}
 
 Choose option below:"""
 
@@ -242,12 +266,13 @@ Choose option below:"""
         # Check if this is a requirements reply for a build (check DATABASE)
         build_data = None
         if user_text and chat_id:
-            build_data = db.get_pending_build(alert_id)
+            build_data = await db.get_pending_build(alert_id)
         
         if build_data:
             # This is requirements input - trigger the actual build
             # Update database with requirements
-            db.update_build_requirements(alert_id, user_text)
+            await db.update_build_requirements(alert_id, user_text)
+            self._awaiting_cache.pop(alert_id, None)
             
             requirements = user_text if user_text.upper() != "DEFAULT" else "None - build as described in tweet"
             
@@ -272,7 +297,7 @@ User requirements: {requirements}"""
                 )
                 
                 # Mark as completed in database
-                db.mark_build_completed(alert_id, success=result["success"])
+                await db.mark_build_completed(alert_id, success=result["success"])
                 
                 if result["success"]:
                     if alert_id in self.pending_tweets:
@@ -290,7 +315,7 @@ User requirements: {requirements}"""
 🔗 Repo: {repo_url}
 
 Your customizations:
-{requirements[:80]}...
+{truncate(requirements, 80)}
 
 ⏱️ Time: ~{result.get('stats', {}).get('total_time', 'N/A')}s
 💰 Cost: ~${result.get('stats', {}).get('cost', 'N/A')}
@@ -308,7 +333,7 @@ Next steps in repo README! 🎉"""
                     await self.send_message(chat_id, error_msg)
                     return {"success": False, "message": error_msg}
             except Exception as e:
-                db.mark_build_completed(alert_id, success=False)
+                await db.mark_build_completed(alert_id, success=False)
                 error_msg = f"❌ [{alert_id}] BUILD ERROR\n\n{e}\n\nPlease try again."
                 await self.send_message(chat_id, error_msg)
                 return {"success": False, "message": error_msg}
@@ -366,7 +391,7 @@ Next steps in repo README! 🎉"""
                     
                     return {
                         "success": True,
-                        "message": f"[{alert_id}] BUILD STARTED!\nProject: {result['project_name'][:30]}..."
+                        "message": f"[{alert_id}] BUILD STARTED!\nProject: {truncate(result['project_name'], 30)}"
                     }
                 else:
                     return {"success": False, "message": f"[{alert_id}] Build failed: {result.get('error', 'Unknown')}"}
@@ -394,9 +419,32 @@ Next steps in repo README! 🎉"""
             if data.get("status") == "pending"
         ]
     
-    def is_awaiting_requirements(self, alert_id: str) -> bool:
+    def _cache_awaiting(self, alert_id: str):
+        """Remember that this alert is awaiting requirements."""
+        self._awaiting_cache.pop(alert_id, None)
+        self._awaiting_cache[alert_id] = time.monotonic() + self.AWAITING_CACHE_TTL
+        if len(self._awaiting_cache) > self.AWAITING_CACHE_SIZE:
+            # Drop the oldest entry (dicts keep insertion order)
+            del self._awaiting_cache[next(iter(self._awaiting_cache))]
+    
+    async def is_awaiting_requirements(self, alert_id: str) -> bool:
         """Check if we're waiting for requirements for this alert."""
-        return alert_id in self.awaiting_requirements
+        expires = self._awaiting_cache.get(alert_id)
+        if expires is not None:
+            if expires > time.monotonic():
+                return True
+            del self._awaiting_cache[alert_id]
+        
+        # Cache miss - ask the DATABASE
+        try:
+            awaiting = bool(await db.get_pending_build(alert_id))
+        except Exception as e:
+            logger.error(f"Failed to check pending build [{alert_id}]: {e}")
+            return False
+        
+        if awaiting:
+            self._cache_awaiting(alert_id)
+        return awaiting
     
     async def set_webhook(self, webhook_url: str) -> Dict:
         """Set webhook URL for receiving updates."""
@@ -404,20 +452,20 @@ Next steps in repo README! 🎉"""
             return {"success": False, "error": "Not configured"}
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/setWebhook",
-                    json={"url": webhook_url}
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("ok"):
-                        return {"success": True, "message": "Webhook set!"}
-                    else:
-                        return {"success": False, "error": data.get("description", "Unknown")}
+            client = get_client()
+            response = await client.post(
+                f"{self.base_url}/setWebhook",
+                json={"url": webhook_url}
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                if data.get("ok"):
+                    return {"success": True, "message": "Webhook set!"}
                 else:
-                    return {"success": False, "error": response.text}
+                    return {"success": False, "error": data.get("description", "Unknown")}
+            else:
+                return {"success": False, "error": response.text}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
@@ -5,10 +5,71 @@ import asyncio
 import os
 from datetime import datetime
 
+import httpx
+
 from config import settings
 from models import Tweet
 
 
+async def check_telegram() -> tuple:
+    """Send a test message via Telegram (PRIMARY - FREE!)."""
+    from telegram_bot import telegram_bot
+    
+    if not telegram_bot.enabled:
+        return False, "Telegram not configured"
+    
+    result = await telegram_bot.send_message(
+        chat_id=settings.TELEGRAM_CHAT_ID,
+        text="""🧪 *SYSTEM TEST*
+
+Twitter Monitor Bot is working!
+
+✅ Configuration: OK
+✅ Telegram: Connected (FREE!)
+✅ AI Models: Ready (Kimi + Qwen)
+✅ GitHub: Ready
+
+Monitor runs every 30 minutes.
+You'll get Telegram alerts for high-value tweets (8-10/10).
+
+━━━━━━━━━━━━━━━━━━━━━━
+*When you get alerts, reply:*
+1️⃣ *INTERESTING* → Share to Discord
+2️⃣ *NOTHING* → Skip this  
+3️⃣ *BUILD* → 🚀 Create project
+━━━━━━━━━━━━━━━━━━━━━━
+
+💡 *Quick reply:* Type 1/2/3 or I/N/B"""
+    )
+    
+    if result.get("sent"):
+        return True, "Telegram test message sent! Check your Telegram."
+    return False, f"Telegram send failed: {result.get('error')}"
+
+
+async def check_ai() -> tuple:
+    """Quick round-trip through the AI Router (Kimi + Qwen)."""
+    from ai_router import ai_router
+    
+    response = await ai_router.generate(
+        prompt="Say 'Kimi and Qwen are ready!'",
+        task_type="docs",
+        max_tokens=50
+    )
+    return True, f"AI Response: {response[:50]}..."
+
+
+async def check_github(client: httpx.AsyncClient) -> tuple:
+    """Verify the GitHub token using the shared client."""
+    response = await client.get(
+        f"https://api.github.com/users/{settings.GITHUB_USERNAME}",
+        headers={"Authorization": f"token {settings.GITHUB_TOKEN}"}
+    )
+    if response.status_code == 200:
+        return True, f"GitHub connected: @{settings.GITHUB_USERNAME}"
+    return False, f"GitHub error: {response.status_code}"
+
+
 async def test_complete_flow():
     """Test the complete Twitter Monitor + Build system."""
     
@@ -41,84 +102,31 @@ async def test_complete_flow():
         print("Add missing env vars to Render: https://dashboard.render.com")
         return False
     
-    # 2. Test Telegram (PRIMARY - FREE!)
+    # 2-4. Run independent checks concurrently (one shared HTTP client)
     print("\n2️⃣ Testing Telegram (FREE)...")
-    try:
-        from telegram_bot import telegram_bot
-        
-        if telegram_bot.enabled:
-            print("  ✅ Telegram configured")
-            
-            # Send test message
-            result = await telegram_bot.send_message(
-                chat_id=settings.TELEGRAM_CHAT_ID,
-                text="""🧪 *SYSTEM TEST*
-
-Twitter Monitor Bot is working!
-
-✅ Configuration: OK
-✅ Telegram: Connected (FREE!)
-✅ AI Models: Ready (Kimi + Qwen)
-✅ GitHub: Ready
-
-Monitor runs every 30 minutes.
-You'll get Telegram alerts for high-value tweets (8-10/10).
-
-━━━━━━━━━━━━━━━━━━━━━━
-*When you get alerts, reply:*
-1️⃣ *INTERESTING* → Share to Discord
-2️⃣ *NOTHING* → Skip this  
-3️⃣ *BUILD* → 🚀 Create project
-━━━━━━━━━━━━━━━━━━━━━━
-
-💡 *Quick reply:* Type 1/2/3 or I/N/B"""
-            )
-            
-            if result.get("sent"):
-                print("  ✅ Test message sent! Check your Telegram.")
-            else:
-                print(f"  ❌ Telegram send failed: {result.get('error')}")
-                return False
-        else:
-            print("  ❌ Telegram not configured")
-            return False
-    except Exception as e:
-        print(f"  ❌ Telegram error: {e}")
-        return False
+    print("3️⃣ Testing AI Router (Kimi + Qwen)...")
+    print("4️⃣ Testing GitHub...")
     
-    # 3. Test AI Router
-    print("\n3️⃣ Testing AI Router (Kimi + Qwen)...")
-    try:
-        from ai_router import ai_router
-        
-        # Quick test
-        response = await ai_router.generate(
-            prompt="Say 'Kimi and Qwen are ready!'",
-            task_type="docs",
-            max_tokens=50
+    async with httpx.AsyncClient() as client:
+        results = await asyncio.gather(
+            check_telegram(),
+            check_ai(),
+            check_github(client),
+            return_exceptions=True
         )
-        print(f"  ✅ AI Response: {response[:50]}...")
-    except Exception as e:
-        print(f"  ❌ AI Router error: {e}")
-        return False
     
-    # 4. Test GitHub
-    print("\n4️⃣ Testing GitHub...")
-    try:
-        import httpx
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://api.github.com/users/{settings.GITHUB_USERNAME}",
-                headers={"Authorization": f"token {settings.GITHUB_TOKEN}"}
-            )
-            if response.status_code == 200:
-                print(f"  ✅ GitHub connected: @{settings.GITHUB_USERNAME}")
-            else:
-                print(f"  ❌ GitHub error: {response.status_code}")
-                return False
-    except Exception as e:
-        print(f"  ❌ GitHub error: {e}")
+    all_good = True
+    for name, result in zip(["Telegram", "AI Router", "GitHub"], results):
+        if isinstance(result, Exception):
+            print(f"  ❌ {name} error: {result}")
+            all_good = False
+            continue
+        ok, message = result
+        print(f"  {'✅' if ok else '❌'} {message}")
+        if not ok:
+            all_good = False
+    
+    if not all_good:
         return False
     
     # 5. Summary
@@ -0,0 +1,10 @@
+"""Small text helpers shared by the Discord, Telegram and WhatsApp senders."""
+
+ELLIPSIS = "..."
+
+
+def truncate(text: str, limit: int) -> str:
+    """Cap text at limit chars (ellipsis included), returning it unchanged when it fits."""
+    if len(text) <= limit:
+        return text
+    return text[:max(0, limit - len(ELLIPSIS))] + ELLIPSIS
@@ -1,14 +1,55 @@
 """Tiered Discord webhook client for routing tweets by importance."""
 
 import asyncio
+import functools
+import time
+from array import array
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 import httpx
 from loguru import logger
 
 from config import settings
+from http_pool import JSON_HEADERS, dumps_json, get_client
 from models import Tweet
+from text_utils import truncate
+
+# numpy is optional - only used to tier large batches of scores at once
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Score (clamped to 0-10) -> tier: 0-3 Filter, 4-6 Standard, 7-8 Premium, 9-10 Urgent
+_TIER_LUT = array("B", [1] * 4 + [2] * 3 + [3] * 2 + [4] * 2)
+
+
+def tier_from_score(score: int) -> int:
+    """Convert a score (1-10) to a tier (1-4)."""
+    return _TIER_LUT[max(0, min(10, score))]
+
+
+def get_tiers_bulk(scores: Iterable[int]) -> List[int]:
+    """Tier many scores at once (vectorized when numpy is installed)."""
+    if NUMPY_AVAILABLE:
+        return np.asarray(_TIER_LUT)[np.clip(np.fromiter(scores, dtype=np.int64), 0, 10)].tolist()
+    return [_TIER_LUT[max(0, min(10, score))] for score in scores]
+
+
+@functools.lru_cache(maxsize=256)
+def _author_urls(username: str) -> Tuple[str, str, str]:
+    """Profile, avatar and status-prefix URLs for an author (monitored set is small)."""
+    profile_url = f"https://twitter.com/{username}"
+    return profile_url, f"https://unavatar.io/twitter/{username}", f"{profile_url}/status/"
+
+
+# Tweet dedup state, deliberately module-level: the scheduler builds a new client
+# every cycle and polls can overlap, so dedup has to span instances
+_SENT_TWEET_IDS: "OrderedDict[str, None]" = OrderedDict()  # sent successfully, oldest first
+_SENDING_TWEET_IDS: Set[str] = set()  # being sent right now (duplicates within one poll)
 
 
 class TieredDiscordClient:
@@ -23,12 +64,42 @@ class TieredDiscordClient:
     """
     
     MAX_TEXT_LENGTH = 4096
+    AVATAR_URL = "https://abs.twimg.com/icons/apple-touch-icon-192x192.png"
+    
+    # Micro-batching: tweets for the same tier within BATCH_WINDOW go out as one request
+    BATCH_WINDOW = 0.2  # seconds
+    BATCH_MAX_EMBEDS = 10  # Discord limit per webhook message
+    BATCH_MAX_CHARS = 6000  # Discord limit for all embeds in one message
+    
+    # Circuit breaker: stop hitting a webhook after repeated failures
+    BREAKER_THRESHOLD = 3  # consecutive failed responses
+    BREAKER_COOLDOWN = 30.0  # seconds
+    
+    # Recently sent tweet ids remembered for dedup (see _SENT_TWEET_IDS)
+    SEEN_MAX = 4096
     
-    def __init__(self):
-        self.client = httpx.AsyncClient(
-            timeout=httpx.Timeout(10),
-            headers={"Content-Type": "application/json"}
-        )
+    # Tier colors
+    COLORS = {
+        1: 0x95a5a6,  # Gray (shouldn't be used)
+        2: 0x3498db,  # Blue (standard)
+        3: 0xf39c12,  # Orange (premium)
+        4: 0xe74c3c,  # Red (urgent)
+    }
+    
+    # Tier labels
+    LABELS = {
+        1: "🚫 FILTERED",
+        2: "📊 STANDARD",
+        3: "⭐ PREMIUM",
+        4: "🚨 URGENT",
+    }
+    
+    # Metric abbreviations, largest first
+    NUMBER_UNITS = ((1_000_000, "M"), (1_000, "k"))
+    
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        # Shared keep-alive pool (see http_pool.py)
+        self.client = client or get_client()
         
         # Load tier webhooks from config
         self.tier_webhooks = {
@@ -37,23 +108,42 @@ class TieredDiscordClient:
             3: settings.DISCORD_WEBHOOK_TIER3,  # Premium
             4: settings.DISCORD_WEBHOOK_TIER4,  # Urgent
         }
+        
+        # Per-tier outbound queues of (embed, future), drained by _flush_loop tasks
+        self._queues: Dict[int, asyncio.Queue] = {}
+        self._flushers: Dict[int, asyncio.Task] = {}
+        
+        # Circuit breaker state, keyed by webhook URL
+        self._failures: Dict[str, int] = {}
+        self._open_until: Dict[str, float] = {}
+        
+        # Webhook URLs parsed once, not on every POST
+        self._webhook_targets: Dict[str, httpx.URL] = {}
     
     async def __aenter__(self):
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
+        # Shared client stays open - closed by http_pool.close_client() on shutdown
+        await self.close()
+    
+    async def close(self) -> None:
+        """Stop the batch flushers, failing anything still queued."""
+        for task in self._flushers.values():
+            task.cancel()
+        await asyncio.gather(*self._flushers.values(), return_exceptions=True)
+        self._flushers.clear()
+        
+        for tier, queue in self._queues.items():
+            while not queue.empty():
+                _, future = queue.get_nowait()
+                if not future.done():
+                    future.set_result(self._result(tier, False, "Client closed"))
+        self._queues.clear()
     
     def get_tier_from_score(self, score: int) -> int:
         """Convert score (1-10) to tier (1-4)."""
-        if score <= 3:
-            return 1  # Filter
-        elif score <= 6:
-            return 2  # Standard
-        elif score <= 8:
-            return 3  # Premium
-        else:
-            return 4  # Urgent
+        return tier_from_score(score)
     
     async def send_tweet(self, username: str, tweet: Tweet, rating: dict) -> dict:
         """
@@ -62,6 +152,32 @@ class TieredDiscordClient:
         Returns:
             {"sent": bool, "tier": int, "webhook": str, "error": str|None}
         """
+        # Already sent (or being sent) - don't POST it again
+        if tweet.id in _SENT_TWEET_IDS or tweet.id in _SENDING_TWEET_IDS:
+            logger.debug(f"Skipping duplicate tweet {tweet.id} from @{username}")
+            return {
+                "sent": False,
+                "tier": None,
+                "webhook": None,
+                "error": None,
+                "reason": "Duplicate"
+            }
+        
+        _SENDING_TWEET_IDS.add(tweet.id)
+        try:
+            result = await self._route_tweet(username, tweet, rating)
+        finally:
+            _SENDING_TWEET_IDS.discard(tweet.id)
+        
+        # Only successful sends count - failures and filtered tweets may come up again
+        if result["sent"]:
+            _SENT_TWEET_IDS[tweet.id] = None
+            if len(_SENT_TWEET_IDS) > self.SEEN_MAX:
+                _SENT_TWEET_IDS.popitem(last=False)
+        return result
+    
+    async def _route_tweet(self, username: str, tweet: Tweet, rating: dict) -> dict:
+        """Pick the tier for a tweet and send it through that tier's batch queue."""
         score = rating.get("score", 5)
         tier = self.get_tier_from_score(score)
         
@@ -87,66 +203,172 @@ class TieredDiscordClient:
                 "error": "No webhook configured"
             }
         
-        # Build tiered payload
+        # Build tiered payload and hand its embed to the tier's batch queue
         payload = self._build_payload(username, tweet, rating, tier)
+        future = asyncio.get_running_loop().create_future()
+        await self._get_queue(tier).put((payload["embeds"][0], future))
+        
+        result = await future
+        if result["sent"]:
+            logger.info(f"Sent tier {tier} tweet from @{username} (score: {score})")
+        return result
+    
+    def _result(self, tier: int, sent: bool, error: Optional[str]) -> dict:
+        """Build a send_tweet result dict."""
+        webhook_url = self.tier_webhooks.get(tier)
+        return {
+            "sent": sent,
+            "tier": tier,
+            "webhook": webhook_url[:50] + "..." if webhook_url else None,
+            "error": error
+        }
+    
+    def _get_queue(self, tier: int) -> asyncio.Queue:
+        """Get the tier's batch queue, (re)starting its flush task if needed."""
+        if tier not in self._queues:
+            self._queues[tier] = asyncio.Queue()
+        
+        task = self._flushers.get(tier)
+        if task is None or task.done():
+            self._flushers[tier] = asyncio.create_task(self._flush_loop(tier))
+        
+        return self._queues[tier]
+    
+    async def _flush_loop(self, tier: int) -> None:
+        """Collect embeds for BATCH_WINDOW, then send them as one webhook message."""
+        queue = self._queues[tier]
+        
+        while True:
+            batch = [await queue.get()]
+            
+            try:
+                await asyncio.sleep(self.BATCH_WINDOW)
+                while len(batch) < self.BATCH_MAX_EMBEDS and not queue.empty():
+                    batch.append(queue.get_nowait())
+                
+                for chunk in self._chunk_batch(batch):
+                    result = await self._post_embeds(tier, [embed for embed, _ in chunk])
+                    for _, future in chunk:
+                        if not future.done():
+                            future.set_result(dict(result))
+            except Exception as e:
+                logger.error(f"Tier {tier} batch send failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(self._result(tier, False, str(e)))
+            finally:
+                # Cancelled mid-send - don't leave callers waiting forever
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(self._result(tier, False, "Client closed"))
+    
+    def _chunk_batch(self, batch: List[Tuple[dict, asyncio.Future]]) -> List[list]:
+        """Split a batch so each message stays under Discord's embed size limit."""
+        chunks = []
+        chunk = []
+        chunk_chars = 0
+        
+        for item in batch:
+            size = self._embed_size(item[0])
+            if chunk and chunk_chars + size > self.BATCH_MAX_CHARS:
+                chunks.append(chunk)
+                chunk = []
+                chunk_chars = 0
+            chunk.append(item)
+            chunk_chars += size
+        
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+    
+    @staticmethod
+    def _embed_size(embed: dict) -> int:
+        """Characters Discord counts towards the per-message embed limit."""
+        size = len(embed.get("title", "")) + len(embed.get("description", ""))
+        size += len(embed.get("author", {}).get("name", ""))
+        size += len(embed.get("footer", {}).get("text", ""))
+        for field in embed.get("fields", []):
+            size += len(field["name"]) + len(field["value"])
+        return size
+    
+    async def _post_embeds(self, tier: int, embeds: List[dict]) -> dict:
+        """POST embeds to the tier webhook with retry."""
+        webhook_url = self.tier_webhooks[tier]
+        
+        # Dead endpoint - skip until the cool-down passes
+        if self._circuit_open(webhook_url):
+            logger.debug(f"Circuit open for tier {tier}, skipping {len(embeds)} embed(s)")
+            return self._result(tier, False, "Circuit open")
+        
+        payload = {
+            "username": f"Twitter Monitor - Tier {tier}",
+            "avatar_url": self.AVATAR_URL,
+            "embeds": embeds
+        }
+        
+        body = dumps_json(payload)
+        target = self._webhook_targets.get(webhook_url)
+        if target is None:
+            target = self._webhook_targets[webhook_url] = httpx.URL(webhook_url)
         
         # Send with retry
         for attempt in range(3):
             try:
-                response = await self.client.post(webhook_url, json=payload)
+                response = await self.client.post(target, content=body, headers=JSON_HEADERS)
                 
                 if response.status_code == 204:
-                    logger.info(f"Sent tier {tier} tweet from @{username} (score: {score})")
-                    return {
-                        "sent": True,
-                        "tier": tier,
-                        "webhook": webhook_url[:50] + "...",
-                        "error": None
-                    }
-                elif response.status_code == 404:
+                    self._record_success(webhook_url)
+                    logger.debug(f"Tier {tier} batch of {len(embeds)} embed(s) sent")
+                    return self._result(tier, True, None)
+                
+                # Rate limiting means the webhook is alive - don't trip the breaker
+                if response.status_code != 429 and self._record_failure(webhook_url):
+                    logger.error(f"Circuit opened for tier {tier} webhook (HTTP {response.status_code})")
+                    return self._result(tier, False, f"HTTP {response.status_code}")
+                
+                if response.status_code == 404:
                     logger.error(f"Webhook not found for tier {tier}")
-                    return {
-                        "sent": False,
-                        "tier": tier,
-                        "webhook": webhook_url[:50] + "...",
-                        "error": "Webhook 404"
-                    }
+                    return self._result(tier, False, "Webhook 404")
                 else:
                     logger.warning(f"Discord error {response.status_code}")
                     if attempt < 2:
                         await asyncio.sleep(1)
                         continue
-                    return {
-                        "sent": False,
-                        "tier": tier,
-                        "webhook": webhook_url[:50] + "...",
-                        "error": f"HTTP {response.status_code}"
-                    }
+                    return self._result(tier, False, f"HTTP {response.status_code}")
                     
             except httpx.TimeoutException:
+                if self._record_failure(webhook_url):
+                    logger.error(f"Circuit opened for tier {tier} webhook (timeouts)")
+                    return self._result(tier, False, "Timeout")
                 if attempt < 2:
                     await asyncio.sleep(1)
                     continue
-                return {
-                    "sent": False,
-                    "tier": tier,
-                    "webhook": webhook_url[:50] + "...",
-                    "error": "Timeout"
-                }
+                return self._result(tier, False, "Timeout")
             except Exception as e:
-                return {
-                    "sent": False,
-                    "tier": tier,
-                    "webhook": webhook_url[:50] + "...",
-                    "error": str(e)
-                }
+                self._record_failure(webhook_url)
+                return self._result(tier, False, str(e))
         
-        return {
-            "sent": False,
-            "tier": tier,
-            "webhook": webhook_url[:50] + "...",
-            "error": "Max retries exceeded"
-        }
+        return self._result(tier, False, "Max retries exceeded")
+    
+    def _circuit_open(self, url: str) -> bool:
+        """True while the URL's breaker is in its cool-down window."""
+        return time.monotonic() < self._open_until.get(url, 0.0)
+    
+    def _record_success(self, url: str) -> None:
+        """Close the breaker after a successful send."""
+        self._failures.pop(url, None)
+        self._open_until.pop(url, None)
+    
+    def _record_failure(self, url: str) -> bool:
+        """Count a failed response; returns True if this opened the breaker."""
+        failures = self._failures.get(url, 0) + 1
+        if failures < self.BREAKER_THRESHOLD:
+            self._failures[url] = failures
+            return False
+        
+        self._failures[url] = 0
+        self._open_until[url] = time.monotonic() + self.BREAKER_COOLDOWN
+        return True
     
     def _build_payload(self, username: str, tweet: Tweet, rating: dict, tier: int) -> dict:
         """Build Discord embed with rating info."""
@@ -155,26 +377,8 @@ class TieredDiscordClient:
         summary = rating.get("summary", tweet.text[:100])
         reason = rating.get("reason", "")
         
-        # Tier colors
-        colors = {
-            1: 0x95a5a6,  # Gray (shouldn't be used)
-            2: 0x3498db,  # Blue (standard)
-            3: 0xf39c12,  # Orange (premium)
-            4: 0xe74c3c,  # Red (urgent)
-        }
-        
-        # Tier labels
-        labels = {
-            1: "🚫 FILTERED",
-            2: "📊 STANDARD",
-            3: "⭐ PREMIUM",
-            4: "🚨 URGENT",
-        }
-        
         # Truncate text
-        description = tweet.text
-        if len(description) > self.MAX_TEXT_LENGTH:
-            description = description[:self.MAX_TEXT_LENGTH - 3] + "..."
+        description = truncate(tweet.text, self.MAX_TEXT_LENGTH)
         
         # Format metrics
         likes = self._format_number(tweet.likes)
@@ -182,18 +386,19 @@ class TieredDiscordClient:
         replies = self._format_number(tweet.replies)
         
         # Build tweet URL
-        tweet_url = f"https://twitter.com/{username}/status/{tweet.id}"
+        profile_url, avatar_url, status_prefix = _author_urls(username)
+        tweet_url = status_prefix + tweet.id
         
         embed = {
             "author": {
-                "name": f"@{username} ({labels[tier]})",
-                "url": f"https://twitter.com/{username}",
-                "icon_url": f"https://unavatar.io/twitter/{username}"
+                "name": f"@{username} ({self.LABELS[tier]})",
+                "url": profile_url,
+                "icon_url": avatar_url
             },
             "title": f"📈 Score: {score}/10 | Category: {category.upper()}",
             "url": tweet_url,
             "description": description,
-            "color": colors[tier],
+            "color": self.COLORS[tier],
             "timestamp": tweet.created_at.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
             "fields": [
                 {
@@ -237,14 +442,14 @@ class TieredDiscordClient:
         
         return {
             "username": f"Twitter Monitor - Tier {tier}",
-            "avatar_url": "https://abs.twimg.com/icons/apple-touch-icon-192x192.png",
+            "avatar_url": self.AVATAR_URL,
             "embeds": [embed]
         }
     
     def _format_number(self, n: int) -> str:
         """Format number (e.g., 1200 -> 1.2k)."""
-        if n >= 1000000:
-            return f"{n/1000000:.1f}M"
-        elif n >= 1000:
-            return f"{n/1000:.1f}k"
-        return str(n)
+        if n < 1000:
+            return str(n)
+        for divisor, suffix in self.NUMBER_UNITS:
+            if n >= divisor:
+                return f"{n / divisor:.1f}{suffix}"
@@ -1,15 +1,24 @@
 """TwitterAPI.io client for fetching tweets."""
 
 import asyncio
+import random
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import httpx
 from loguru import logger
 
 from config import settings
+from http_pool import get_client
 from models import Tweet
 
+# ciso8601 (C extension) parses ISO 8601 timestamps with 'Z' directly;
+# Python 3.11+ fromisoformat also accepts 'Z', so no .replace() is needed
+try:
+    from ciso8601 import parse_datetime as parse_iso_datetime
+except ImportError:
+    parse_iso_datetime = datetime.fromisoformat
+
 
 class TwitterAPIError(Exception):
     """Twitter API error."""
@@ -36,77 +45,91 @@ class TwitterClient:
     
     BASE_URL = settings.TWITTERAPI_BASE_URL
     MAX_RETRIES = 3
-    BACKOFF_DELAYS = [2, 4, 8]  # Exponential backoff delays in seconds
+    BACKOFF_BASE = 2.0  # Seconds, doubled each attempt (2, 4, 8...)
+    BACKOFF_JITTER = 0.5  # Up to +50% random spread to avoid retry storms
+    BACKOFF_MAX = 30.0
+    MAX_CONCURRENT = 20  # In-flight requests for get_last_tweets_many (stay under the rate limit)
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, client: Optional[httpx.AsyncClient] = None):
         self.api_key = api_key or settings.TWITTERAPI_KEY
-        self.client = httpx.AsyncClient(
-            timeout=httpx.Timeout(settings.TWITTERAPI_TIMEOUT),
-            headers={
-                "x-api-key": self.api_key,
-                "Accept": "application/json"
-            }
-        )
+        self.headers = {
+            "x-api-key": self.api_key,
+            "Accept": "application/json"
+        }
+        self.timeout = httpx.Timeout(settings.TWITTERAPI_TIMEOUT)
+        # Shared keep-alive pool (see http_pool.py)
+        self.client = client or get_client()
     
     async def __aenter__(self):
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
+        # Shared client stays open - closed by http_pool.close_client() on shutdown
+        pass
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter, capped at BACKOFF_MAX."""
+        delay = self.BACKOFF_BASE * 2 ** attempt * (1 + random.random() * self.BACKOFF_JITTER)
+        return min(self.BACKOFF_MAX, delay)
     
     async def _make_request(
         self,
         endpoint: str,
-        params: dict = None,
-        retry_count: int = 0
+        params: dict = None
     ) -> dict:
         """Make HTTP request with error handling and retry logic."""
         url = f"{self.BASE_URL}{endpoint}"
         
-        try:
-            response = await self.client.get(url, params=params)
-            
-            if response.status_code == 200:
-                return response.json()
-            
-            elif response.status_code == 401:
-                logger.error("TwitterAPI returned 401 - Invalid API Key")
-                raise TwitterAuthError("Invalid API Key")
-            
-            elif response.status_code == 404:
-                logger.warning(f"User not found (404): {params}")
-                raise TwitterNotFoundError("User not found")
-            
-            elif response.status_code == 429:
-                if retry_count < len(self.BACKOFF_DELAYS):
-                    delay = self.BACKOFF_DELAYS[retry_count]
-                    logger.warning(f"Rate limited (429). Retrying in {delay}s...")
-                    await asyncio.sleep(delay)
-                    return await self._make_request(endpoint, params, retry_count + 1)
-                else:
+        for attempt in range(self.MAX_RETRIES + 1):
+            try:
+                response = await self.client.get(
+                    url, params=params, headers=self.headers, timeout=self.timeout
+                )
+                
+                if response.status_code == 200:
+                    return response.json()
+                
+                elif response.status_code == 401:
+                    logger.error("TwitterAPI returned 401 - Invalid API Key")
+                    raise TwitterAuthError("Invalid API Key")
+                
+                elif response.status_code == 404:
+                    logger.warning(f"User not found (404): {params}")
+                    raise TwitterNotFoundError("User not found")
+                
+                elif response.status_code == 429:
+                    if attempt < self.MAX_RETRIES:
+                        delay = self._backoff_delay(attempt)
+                        logger.warning(f"Rate limited (429). Retrying in {delay:.1f}s...")
+                        await asyncio.sleep(delay)
+                        continue
                     logger.error("Rate limit exceeded. Max retries reached.")
                     raise TwitterRateLimitError("Rate limit exceeded")
+                
+                else:
+                    response.raise_for_status()
+                    # Non-error status without a body we use (e.g. 204)
+                    return None
             
-            else:
-                response.raise_for_status()
-        
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error {e.response.status_code}: {e}")
-            raise TwitterAPIError(f"HTTP {e.response.status_code}: {e}")
-        
-        except httpx.RequestError as e:
-            if retry_count < self.MAX_RETRIES:
-                logger.warning(f"Network error: {e}. Retrying...")
-                await asyncio.sleep(1)
-                return await self._make_request(endpoint, params, retry_count + 1)
-            raise TwitterAPIError(f"Network error after {self.MAX_RETRIES} retries: {e}")
+            except httpx.HTTPStatusError as e:
+                logger.error(f"HTTP error {e.response.status_code}: {e}")
+                raise TwitterAPIError(f"HTTP {e.response.status_code}: {e}")
+            
+            except httpx.RequestError as e:
+                if attempt < self.MAX_RETRIES:
+                    delay = self._backoff_delay(attempt)
+                    logger.warning(f"Network error: {e}. Retrying in {delay:.1f}s...")
+                    await asyncio.sleep(delay)
+                    continue
+                raise TwitterAPIError(f"Network error after {self.MAX_RETRIES} retries: {e}")
     
     async def get_last_tweets(
         self,
         username: str,
-        max_results: int = None
+        max_results: int = None,
+        since_id: Optional[int] = None
     ) -> List[Tweet]:
-        """Fetch last tweets for a user."""
+        """Fetch last tweets for a user (only those newer than since_id, if given)."""
         max_results = max_results or settings.MAX_TWEETS_PER_CHECK
         
         params = {
@@ -116,7 +139,7 @@ class TwitterClient:
         
         try:
             data = await self._make_request("/twitter/user/last_tweets", params)
-            return self._parse_tweets(data)
+            return self._parse_tweets(data, since_id)
         
         except TwitterNotFoundError:
             # Return empty list, caller should handle user not found
@@ -129,12 +152,25 @@ class TwitterClient:
             logger.error(f"Failed to fetch tweets for @{username}: {e}")
             return []
     
-    def _parse_tweets(self, data: dict) -> List[Tweet]:
-        """Parse API response into Tweet models."""
-        tweets = []
+    async def get_last_tweets_many(
+        self,
+        usernames: List[str],
+        max_results: int = None
+    ) -> Dict[str, List[Tweet]]:
+        """Fetch last tweets for several users concurrently (multiplexed on the shared pool)."""
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT)
+        
+        async def fetch(username: str) -> List[Tweet]:
+            async with semaphore:
+                return await self.get_last_tweets(username, max_results)
         
+        results = await asyncio.gather(*(fetch(username) for username in usernames))
+        return dict(zip(usernames, results))
+    
+    def _parse_tweets(self, data: dict, since_id: Optional[int] = None) -> List[Tweet]:
+        """Parse API response into Tweet models, skipping ids <= since_id."""
         if not data or not isinstance(data, dict):
-            return tweets
+            return []
         
         # Handle nested data structure
         tweet_data = data.get("data", data)
@@ -145,68 +181,82 @@ class TwitterClient:
         else:
             tweet_list = []
         
-        for tweet_dict in tweet_list:
-            try:
-                tweet = self._parse_single_tweet(tweet_dict)
-                if tweet:
-                    tweets.append(tweet)
-            except Exception as e:
-                logger.warning(f"Failed to parse tweet: {e}")
-                continue
+        # Already-seen tweets are most of every poll - drop them before the full parse
+        if since_id is not None:
+            tweet_list = [item for item in tweet_list if self._is_newer(item, since_id)]
         
-        return tweets
+        # One fallback timestamp for the whole batch
+        now = datetime.utcnow()
+        parse = self._parse_single_tweet
+        return [tweet for tweet in (parse(item, now) for item in tweet_list) if tweet is not None]
     
-    def _parse_single_tweet(self, data: dict) -> Optional[Tweet]:
-        """Parse a single tweet from API response."""
+    @staticmethod
+    def _is_newer(data: dict, cutoff: int) -> bool:
+        """True if the raw tweet's id is above cutoff (or can't be read - let the parser decide)."""
+        try:
+            return int(data["id"]) > cutoff
+        except (KeyError, TypeError, ValueError):
+            return True
+    
+    def _parse_single_tweet(self, data: dict, now: Optional[datetime] = None) -> Optional[Tweet]:
+        """Parse a single tweet from API response (None if invalid)."""
         if not data or not isinstance(data, dict):
             return None
         
-        tweet_id = str(data.get("id", ""))
-        text = data.get("text", "")
-        
-        if not tweet_id or not text:
-            return None
-        
-        # Parse created_at
-        created_at_str = data.get("created_at", "")
         try:
-            # Handle ISO format
-            created_at = datetime.fromisoformat(created_at_str.replace("Z", "+00:00"))
-        except (ValueError, AttributeError):
-            created_at = datetime.utcnow()
-        
-        # Parse metrics
-        metrics = data.get("public_metrics", {})
-        likes = metrics.get("like_count", 0)
-        retweets = metrics.get("retweet_count", 0)
-        replies = metrics.get("reply_count", 0)
-        
-        # Parse media URLs
-        media_urls = []
-        entities = data.get("entities", {})
-        media_list = entities.get("media", [])
-        
-        for media in media_list:
-            if media.get("type") == "photo":
-                url = media.get("url") or media.get("media_url_https")
-                if url:
-                    media_urls.append(url)
-            elif media.get("type") in ("video", "animated_gif"):
-                # For videos, use thumbnail if available
-                thumbnail = media.get("preview_image_url") or media.get("media_url_https")
-                if thumbnail:
-                    media_urls.append(thumbnail)
-        
-        # Build tweet URL (Twitter format)
-        tweet_url = f"https://twitter.com/i/web/status/{tweet_id}"
+            tweet_id = str(data.get("id", ""))
+            text = data.get("text", "")
+            
+            if not tweet_id or not text:
+                return None
+            
+            # Parse created_at
+            created_at_str = data.get("created_at", "")
+            if not created_at_str:
+                created_at = now or datetime.utcnow()
+            else:
+                try:
+                    # Handle ISO format (e.g. 2024-01-01T00:00:00.000Z)
+                    created_at = parse_iso_datetime(created_at_str)
+                except (ValueError, TypeError):
+                    created_at = now or datetime.utcnow()
+            
+            # Parse metrics
+            metrics = data.get("public_metrics", {})
+            likes = metrics.get("like_count", 0)
+            retweets = metrics.get("retweet_count", 0)
+            replies = metrics.get("reply_count", 0)
+            
+            # Parse media URLs
+            media_urls = []
+            entities = data.get("entities", {})
+            media_list = entities.get("media", [])
+            
+            for media in media_list:
+                if media.get("type") == "photo":
+                    url = media.get("url") or media.get("media_url_https")
+                    if url:
+                        media_urls.append(url)
+                elif media.get("type") in ("video", "animated_gif"):
+                    # For videos, use thumbnail if available
+                    thumbnail = media.get("preview_image_url") or media.get("media_url_https")
+                    if thumbnail:
+                        media_urls.append(thumbnail)
+            
+            # Build tweet URL (Twitter format)
+            tweet_url = f"https://twitter.com/i/web/status/{tweet_id}"
+            
+            return Tweet(
+                id=tweet_id,
+                text=text,
+                created_at=created_at,
+                likes=likes,
+                retweets=retweets,
+                replies=replies,
+                url=tweet_url,
+                media_urls=media_urls
+            )
         
-        return Tweet(
-            id=tweet_id,
-            text=text,
-            created_at=created_at,
-            likes=likes,
-            retweets=retweets,
-            replies=replies,
-            url=tweet_url,
-            media_urls=media_urls
-        )
+        except Exception as e:
+            logger.warning(f"Failed to parse tweet: {e}")
+            return None
@@ -8,14 +8,75 @@ Sends critical tweets directly to phone via:
 """
 
 import asyncio
+import functools
 from typing import Optional
 
 import httpx
 from loguru import logger
 
 from config import settings
+from http_pool import JSON_HEADERS, dumps_json, get_client
 from models import Tweet
 
+# Message bodies, filled with str.format_map in one pass per send
+_SMS_TEMPLATE = """🚨 URGENT TWEET {score}/10
+
+@{username}: {summary}...
+
+Category: {category}
+Open: https://twitter.com/{username}
+"""
+
+_WHATSAPP_TEMPLATE = """🚨 *URGENT TWEET ALERT* 🚨
+
+*Score:* {score}/10 ⭐
+*From:* @{username}
+*Category:* {category}
+
+*Content:*
+{summary}
+
+*Why urgent:*
+{reason}
+
+🔗 Open: https://twitter.com/{username}/status/{tweet_id}
+
+━━━━━━━━━━━━━━━━━━━━━━
+*Reply with:*
+1️⃣ *INTERESTING* → Share to Discord
+2️⃣ *NOTHING* → Skip this  
+3️⃣ *BUILD* → Create project
+━━━━━━━━━━━━━━━━━━━━━━
+
+💡 *Quick reply:*
+Type: 1 / 2 / 3
+Or: I / N / B"""
+
+_TG_TEMPLATE = """{emoji} <b>URGENT TWEET {score}/10</b> {emoji}
+
+<b>From:</b> @{username}
+<b>Category:</b> {category}
+
+<b>Content:</b>
+{summary}
+
+<b>AI Reasoning:</b>
+{reason}
+
+<a href="https://twitter.com/{username}/status/{tweet_id}">🔗 View on Twitter</a>
+
+<i>Sent by Twitter Monitor Bot</i>
+"""
+
+# Telegram parse_mode=HTML rejects bare &, < and > in text
+_HTML_TRANS = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+
+@functools.lru_cache(maxsize=64)
+def _whatsapp_address(number: str) -> str:
+    """Normalize a phone number to Twilio's whatsapp:+123... form."""
+    return number if number.startswith("whatsapp:") else f"whatsapp:{number}"
+
 
 class UrgentNotifier:
     """
@@ -24,7 +85,13 @@ class UrgentNotifier:
     Ensures you never miss life-changing alpha!
     """
     
-    def __init__(self):
+    CHANNEL_LABELS = {
+        "whatsapp": "💬 WhatsApp ($$$)",
+        "sms": "📱 SMS ($$$)",
+        "pushover": "🔔 Pushover",
+    }
+    
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         self.enabled = settings.URGENT_NOTIFICATIONS_ENABLED
         self.min_score = settings.URGENT_MIN_SCORE  # Usually 9
         
@@ -33,6 +100,7 @@ class UrgentNotifier:
         self.twilio_token = settings.TWILIO_AUTH_TOKEN
         self.twilio_from = settings.TWILIO_PHONE_NUMBER
         self.your_phone = settings.YOUR_PHONE_NUMBER
+        self.channel_strategy = settings.URGENT_CHANNEL_STRATEGY
         
         # Telegram
         self.telegram_bot_token = settings.TELEGRAM_BOT_TOKEN
@@ -42,14 +110,21 @@ class UrgentNotifier:
         self.pushover_token = settings.PUSHOVER_APP_TOKEN
         self.pushover_user = settings.PUSHOVER_USER_KEY
         
-        # HTTP client
-        self.client = httpx.AsyncClient(timeout=httpx.Timeout(30))
+        # Pre-built endpoints/auth (reused by every send)
+        self._twilio_url = f"https://api.twilio.com/2010-04-01/Accounts/{self.twilio_sid}/Messages.json"
+        self._twilio_auth = httpx.BasicAuth(self.twilio_sid, self.twilio_token)
+        self._telegram_url = f"https://api.telegram.org/bot{self.telegram_bot_token}/sendMessage"
+        
+        # HTTP client - shared keep-alive pool (see http_pool.py)
+        self.client = client or get_client()
+        self.timeout = httpx.Timeout(30)
     
     async def __aenter__(self):
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
+        # Shared client stays open - closed by http_pool.close_client() on shutdown
+        pass
     
     async def send_urgent_notification(
         self,
@@ -60,7 +135,7 @@ class UrgentNotifier:
         """
         Send urgent notification for high-value tweet.
         
-        Priority: Telegram (FREE) → WhatsApp → SMS
+        Priority: Telegram (FREE) → WhatsApp + SMS + Pushover (in parallel)
         """
         if not self.enabled:
             return {"sent": False, "reason": "Notifications disabled"}
@@ -91,27 +166,25 @@ class UrgentNotifier:
                 logger.error(f"Telegram failed: {e}")
                 results["telegram"] = {"sent": False, "error": str(e)}
         
-        # 2. Fallback to WhatsApp (expensive)
-        if self.twilio_sid and self.your_phone:
-            try:
-                result = await self._send_whatsapp(username, tweet, rating)
-                results["whatsapp"] = result
-                if result.get("sent"):
-                    logger.info(f"💬 WhatsApp sent for urgent tweet from @{username} ($$$)")
-            except Exception as e:
-                logger.error(f"WhatsApp failed: {e}")
-                results["whatsapp"] = {"sent": False, "error": str(e)}
+        # 2. Fallbacks (WhatsApp/SMS $$$, Pushover) - independent hosts, send concurrently
+        twilio_ready = self.twilio_sid and self.your_phone
+        strategy = self.channel_strategy
         
-        # 3. Last resort: SMS
-        if self.twilio_sid and self.your_phone:
-            try:
-                result = await self._send_sms(username, tweet, rating)
-                results["sms"] = result
-                if result.get("sent"):
-                    logger.info(f"📱 SMS sent for urgent tweet from @{username} ($$$)")
-            except Exception as e:
-                logger.error(f"SMS failed: {e}")
-                results["sms"] = {"sent": False, "error": str(e)}
+        tasks = []
+        if twilio_ready and strategy in ("all", "whatsapp_only"):
+            tasks.append(("whatsapp", self._send_whatsapp(username, tweet, rating)))
+        if twilio_ready and strategy in ("all", "sms_only", "sms_then_whatsapp_fallback"):
+            tasks.append(("sms", self._send_sms(username, tweet, rating)))
+        if self.pushover_token and self.pushover_user:
+            tasks.append(("pushover", self._send_pushover(username, tweet, rating)))
+        
+        await self._gather_channels(username, tasks, results)
+        
+        # 3. WhatsApp only when the SMS didn't go through (one Twilio message instead of two)
+        if twilio_ready and strategy == "sms_then_whatsapp_fallback" and not results["sms"].get("sent"):
+            await self._gather_channels(
+                username, [("whatsapp", self._send_whatsapp(username, tweet, rating))], results
+            )
         
         # Return summary
         any_sent = any(r.get("sent") for r in results.values())
@@ -122,6 +195,21 @@ class UrgentNotifier:
             "username": username
         }
     
+    async def _gather_channels(self, username: str, tasks: list, results: dict) -> None:
+        """Run (channel, coroutine) sends concurrently, storing each result in results."""
+        if not tasks:
+            return
+        
+        results_list = await asyncio.gather(*(t for _, t in tasks), return_exceptions=True)
+        for (channel, _), result in zip(tasks, results_list):
+            label = self.CHANNEL_LABELS[channel]
+            if isinstance(result, Exception):
+                logger.error(f"{label} failed: {result}")
+                result = {"sent": False, "error": str(result)}
+            elif result.get("sent"):
+                logger.info(f"{label} sent for urgent tweet from @{username}")
+            results[channel] = result
+    
     async def _send_sms(self, username: str, tweet: Tweet, rating: dict) -> dict:
         """Send SMS via Twilio."""
         if not all([self.twilio_sid, self.twilio_token, self.twilio_from, self.your_phone]):
@@ -132,17 +220,17 @@ class UrgentNotifier:
         category = rating.get("category", "unknown")
         
         # Short message for SMS (160 char limit)
-        message = f"""🚨 URGENT TWEET {score}/10
-
-@{username}: {summary[:80]}...
-
-Category: {category}
-Open: https://twitter.com/{username}
-"""
+        message = _SMS_TEMPLATE.format_map({
+            "score": score,
+            "username": username,
+            "summary": summary[:80],
+            "category": category
+        })
         
         response = await self.client.post(
-            f"https://api.twilio.com/2010-04-01/Accounts/{self.twilio_sid}/Messages.json",
-            auth=(self.twilio_sid, self.twilio_token),
+            self._twilio_url,
+            timeout=self.timeout,
+            auth=self._twilio_auth,
             data={
                 "From": self.twilio_from,
                 "To": self.your_phone,
@@ -166,42 +254,25 @@ Open: https://twitter.com/{username}
         reason = rating.get("reason", "High value content")
         
         # Richer message for WhatsApp with action options
-        message = f"""🚨 *URGENT TWEET ALERT* 🚨
-
-*Score:* {score}/10 ⭐
-*From:* @{username}
-*Category:* {category.upper()}
-
-*Content:*
-{summary}
-
-*Why urgent:*
-{reason}
-
-🔗 Open: https://twitter.com/{username}/status/{tweet.id}
-
-━━━━━━━━━━━━━━━━━━━━━━
-*Reply with:*
-1️⃣ *INTERESTING* → Share to Discord
-2️⃣ *NOTHING* → Skip this  
-3️⃣ *BUILD* → Create project
-━━━━━━━━━━━━━━━━━━━━━━
-
-💡 *Quick reply:*
-Type: 1 / 2 / 3
-Or: I / N / B"""
+        message = _WHATSAPP_TEMPLATE.format_map({
+            "score": score,
+            "username": username,
+            "category": category.upper(),
+            "summary": summary,
+            "reason": reason,
+            "tweet_id": tweet.id
+        })
         
         # Use Twilio WhatsApp sandbox number (NOT your regular Twilio number)
         # This is the number you sent "join" message to
         from_number = "whatsapp:+14155238886"
         
-        to_number = self.your_phone
-        if not to_number.startswith("whatsapp:"):
-            to_number = f"whatsapp:{to_number}"
+        to_number = _whatsapp_address(self.your_phone)
         
         response = await self.client.post(
-            f"https://api.twilio.com/2010-04-01/Accounts/{self.twilio_sid}/Messages.json",
-            auth=(self.twilio_sid, self.twilio_token),
+            self._twilio_url,
+            timeout=self.timeout,
+            auth=self._twilio_auth,
             data={
                 "From": from_number,
                 "To": to_number,
@@ -221,13 +292,12 @@ Or: I / N / B"""
         
         from_number = "whatsapp:+14155238886"
         
-        to_number = to
-        if not to_number.startswith("whatsapp:"):
-            to_number = f"whatsapp:{to_number}"
+        to_number = _whatsapp_address(to)
         
         response = await self.client.post(
-            f"https://api.twilio.com/2010-04-01/Accounts/{self.twilio_sid}/Messages.json",
-            auth=(self.twilio_sid, self.twilio_token),
+            self._twilio_url,
+            timeout=self.timeout,
+            auth=self._twilio_auth,
             data={
                 "From": from_number,
                 "To": to_number,
@@ -253,30 +323,26 @@ Or: I / N / B"""
         # Emoji based on score
         emoji = "🚨" if score >= 10 else "⭐" if score == 9 else "💎"
         
-        message = f"""{emoji} <b>URGENT TWEET {score}/10</b> {emoji}
-
-<b>From:</b> @{username}
-<b>Category:</b> {category.upper()}
-
-<b>Content:</b>
-{summary}
-
-<b>AI Reasoning:</b>
-{reason}
-
-<a href="https://twitter.com/{username}/status/{tweet.id}">🔗 View on Twitter</a>
-
-<i>Sent by Twitter Monitor Bot</i>
-"""
+        message = _TG_TEMPLATE.format_map({
+            "emoji": emoji,
+            "score": score,
+            "username": username,
+            "category": category.upper().translate(_HTML_TRANS),
+            "summary": summary.translate(_HTML_TRANS),
+            "reason": reason.translate(_HTML_TRANS),
+            "tweet_id": tweet.id
+        })
         
         response = await self.client.post(
-            f"https://api.telegram.org/bot{self.telegram_bot_token}/sendMessage",
-            json={
+            self._telegram_url,
+            timeout=self.timeout,
+            headers=JSON_HEADERS,
+            content=dumps_json({
                 "chat_id": self.telegram_chat_id,
                 "text": message,
                 "parse_mode": "HTML",
                 "disable_web_page_preview": False
-            }
+            })
         )
         
         if response.status_code == 200:
@@ -298,6 +364,7 @@ Or: I / N / B"""
         
         response = await self.client.post(
             "https://api.pushover.net/1/messages.json",
+            timeout=self.timeout,
             data={
                 "token": self.pushover_token,
                 "user": self.pushover_user,
@@ -12,22 +12,38 @@ Vercel AI SDK provides:
 Source: https://github.com/vercel/ai
 """
 
-from typing import Dict, List, Optional, Any
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Final, List, Mapping
 
+# Keywords that mark a project as AI-flavored (matched at the start of a word)
+AI_KEYWORDS = (
+    'ai', 'chat', 'gpt', 'llm', 'openai', 'claude',
+    'assistant', 'bot', 'generate', 'summarize',
+    'analyze', 'semantic', 'embedding', 'vector',
+    'rag', 'retrieval', 'agent', 'automation',
+    'content', 'writing', 'creative'
+)
+_AI_KEYWORD_RE = re.compile(r"\b(" + "|".join(map(re.escape, AI_KEYWORDS)) + ")", re.IGNORECASE)
 
-class VercelAISkill:
-    """
-    Vercel AI SDK patterns for building AI-native applications.
-    
-    Repo: vercel/ai (10k+ stars)
-    Docs: sdk.vercel.ai
-    """
-    
-    # ═══════════════════════════════════════════════════════════════
-    # STREAMING PATTERNS
-    # ═══════════════════════════════════════════════════════════════
-    
-    STREAMING_PATTERNS = """
+
+@lru_cache(maxsize=10_000)
+def _has_ai_keywords(text: str, needed: int = 2) -> bool:
+    """True once `needed` distinct AI keywords appear in text (cached per text)."""
+    seen = set()
+    for match in _AI_KEYWORD_RE.finditer(text):
+        seen.add(match.group(1).lower())
+        if len(seen) >= needed:
+            return True
+    return False
+
+
+# ═══════════════════════════════════════════════════════════════
+# STREAMING PATTERNS
+# ═══════════════════════════════════════════════════════════════
+
+STREAMING_PATTERNS: Final[str] = """
     Vercel AI SDK Streaming Patterns:
     
     1. REAL-TIME UI UPDATES
@@ -52,12 +68,12 @@ class VercelAISkill:
     });
     ```
     """
-    
-    # ═══════════════════════════════════════════════════════════════
-    # TOOL CALLING (FUNCTION CALLING)
-    # ═══════════════════════════════════════════════════════════════
-    
-    TOOL_CALLING_PATTERNS = """
+
+# ═══════════════════════════════════════════════════════════════
+# TOOL CALLING (FUNCTION CALLING)
+# ═══════════════════════════════════════════════════════════════
+
+TOOL_CALLING_PATTERNS: Final[str] = """
     Vercel AI SDK Tool Calling:
     
     1. DEFINING TOOLS
@@ -93,12 +109,12 @@ class VercelAISkill:
     - Handle tool errors gracefully
     - Show tool execution status in UI
     """
-    
-    # ═══════════════════════════════════════════════════════════════
-    # STRUCTURED OUTPUTS
-    # ═══════════════════════════════════════════════════════════════
-    
-    STRUCTURED_OUTPUTS = """
+
+# ═══════════════════════════════════════════════════════════════
+# STRUCTURED OUTPUTS
+# ═══════════════════════════════════════════════════════════════
+
+STRUCTURED_OUTPUTS: Final[str] = """
     Vercel AI SDK Structured Outputs:
     
     1. OBJECT GENERATION
@@ -129,12 +145,12 @@ class VercelAISkill:
     - Analysis results
     - Report generation
     """
-    
-    # ═══════════════════════════════════════════════════════════════
-    # RAG (RETRIEVAL-AUGMENTED GENERATION)
-    # ═══════════════════════════════════════════════════════════════
-    
-    RAG_PATTERNS = """
+
+# ═══════════════════════════════════════════════════════════════
+# RAG (RETRIEVAL-AUGMENTED GENERATION)
+# ═══════════════════════════════════════════════════════════════
+
+RAG_PATTERNS: Final[str] = """
     Vercel AI SDK RAG Patterns:
     
     1. VECTOR STORE INTEGRATION
@@ -172,12 +188,12 @@ class VercelAISkill:
     - Show sources to users
     - Cache embeddings
     """
-    
-    # ═══════════════════════════════════════════════════════════════
-    # AI UI COMPONENTS
-    # ═══════════════════════════════════════════════════════════════
-    
-    AI_UI_PATTERNS = """
+
+# ═══════════════════════════════════════════════════════════════
+# AI UI COMPONENTS
+# ═══════════════════════════════════════════════════════════════
+
+AI_UI_PATTERNS: Final[str] = """
     Vercel AI SDK UI Components:
     
     1. CHAT INTERFACE
@@ -223,12 +239,12 @@ class VercelAISkill:
     - Mermaid diagram support
     - LaTeX math rendering
     """
-    
-    # ═══════════════════════════════════════════════════════════════
-    # MULTI-STEP AGENTS
-    # ═══════════════════════════════════════════════════════════════
-    
-    AGENT_PATTERNS = """
+
+# ═══════════════════════════════════════════════════════════════
+# MULTI-STEP AGENTS
+# ═══════════════════════════════════════════════════════════════
+
+AGENT_PATTERNS: Final[str] = """
     Vercel AI SDK Agent Patterns:
     
     1. REACT PATTERN (Reasoning + Acting)
@@ -262,12 +278,12 @@ class VercelAISkill:
     });
     ```
     """
-    
-    # ═══════════════════════════════════════════════════════════════
-    # PROVIDER PATTERNS
-    # ═══════════════════════════════════════════════════════════════
-    
-    PROVIDER_SETUP = """
+
+# ═══════════════════════════════════════════════════════════════
+# PROVIDER PATTERNS
+# ═══════════════════════════════════════════════════════════════
+
+PROVIDER_SETUP: Final[str] = """
     Vercel AI SDK Provider Setup:
     
     Supported Providers:
@@ -296,6 +312,59 @@ class VercelAISkill:
     - Fallback providers
     - Cost optimization
     """
+
+
+# AI SDK stack recommendation per project type (read-only, shared by every call)
+_STACKS: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "chat_app": MappingProxyType({
+        "framework": "Next.js 14",
+        "ai_sdk": "ai (React hooks)",
+        "ui": "shadcn/ui + Tailwind",
+        "backend": "Next.js API routes",
+        "database": "Vercel Postgres + Vercel KV",
+        "streaming": "Vercel AI SDK streaming",
+        "deployment": "Vercel"
+    }),
+    "ai_api": MappingProxyType({
+        "framework": "FastAPI",
+        "ai_sdk": "Vercel AI SDK Core (Python)",
+        "streaming": "Server-Sent Events (SSE)",
+        "deployment": "Render / Railway",
+        "database": "PostgreSQL"
+    }),
+    "rag_knowledge_base": MappingProxyType({
+        "framework": "Next.js",
+        "ai_sdk": "ai + @ai-sdk/openai",
+        "vector_store": "Pinecone / Supabase pgvector",
+        "embedding": "OpenAI text-embedding-3-small",
+        "ui": "Streaming chat with sources"
+    }),
+    "ai_agent": MappingProxyType({
+        "framework": "Python (FastAPI/Express)",
+        "ai_sdk": "Vercel AI SDK Core",
+        "pattern": "ReAct with tools",
+        "tools": "Custom tool definitions",
+        "state": "Redis / Upstash"
+    })
+})
+
+
+class VercelAISkill:
+    """
+    Vercel AI SDK patterns for building AI-native applications.
+    
+    Repo: vercel/ai (10k+ stars)
+    Docs: sdk.vercel.ai
+    """
+    
+    # Pattern docs (module-level constants above)
+    STREAMING_PATTERNS = STREAMING_PATTERNS
+    TOOL_CALLING_PATTERNS = TOOL_CALLING_PATTERNS
+    STRUCTURED_OUTPUTS = STRUCTURED_OUTPUTS
+    RAG_PATTERNS = RAG_PATTERNS
+    AI_UI_PATTERNS = AI_UI_PATTERNS
+    AGENT_PATTERNS = AGENT_PATTERNS
+    PROVIDER_SETUP = PROVIDER_SETUP
     
     @staticmethod
     def should_use_ai_sdk(project_description: str, features: List[str]) -> bool:
@@ -309,57 +378,14 @@ class VercelAISkill:
         - Streaming responses
         - RAG / knowledge bases
         """
-        ai_keywords = [
-            'ai', 'chat', 'gpt', 'llm', 'openai', 'claude',
-            'assistant', 'bot', 'generate', 'summarize',
-            'analyze', 'semantic', 'embedding', 'vector',
-            'rag', 'retrieval', 'agent', 'automation',
-            'content', 'writing', 'creative'
-        ]
-        
         text = (project_description + ' ' + ' '.join(features)).lower()
-        matches = [kw for kw in ai_keywords if kw in text]
         
-        return len(matches) >= 2  # If 2+ AI keywords, likely AI project
+        return _has_ai_keywords(text)  # If 2+ AI keywords, likely AI project
     
     @staticmethod
-    def get_recommended_stack(project_type: str) -> Dict[str, str]:
-        """Get AI SDK stack recommendation for project type."""
-        
-        stacks = {
-            "chat_app": {
-                "framework": "Next.js 14",
-                "ai_sdk": "ai (React hooks)",
-                "ui": "shadcn/ui + Tailwind",
-                "backend": "Next.js API routes",
-                "database": "Vercel Postgres + Vercel KV",
-                "streaming": "Vercel AI SDK streaming",
-                "deployment": "Vercel"
-            },
-            "ai_api": {
-                "framework": "FastAPI",
-                "ai_sdk": "Vercel AI SDK Core (Python)",
-                "streaming": "Server-Sent Events (SSE)",
-                "deployment": "Render / Railway",
-                "database": "PostgreSQL"
-            },
-            "rag_knowledge_base": {
-                "framework": "Next.js",
-                "ai_sdk": "ai + @ai-sdk/openai",
-                "vector_store": "Pinecone / Supabase pgvector",
-                "embedding": "OpenAI text-embedding-3-small",
-                "ui": "Streaming chat with sources"
-            },
-            "ai_agent": {
-                "framework": "Python (FastAPI/Express)",
-                "ai_sdk": "Vercel AI SDK Core",
-                "pattern": "ReAct with tools",
-                "tools": "Custom tool definitions",
-                "state": "Redis / Upstash"
-            }
-        }
-        
-        return stacks.get(project_type, stacks["chat_app"])
+    def get_recommended_stack(project_type: str) -> Mapping[str, str]:
+        """Get AI SDK stack recommendation for project type (read-only - copy to modify)."""
+        return _STACKS.get(project_type, _STACKS["chat_app"])
     
     @staticmethod
     def generate_ai_component_prompt(component_type: str, description: str) -> str:
@@ -8,19 +8,206 @@ User receives urgent tweet via WhatsApp and can reply:
 """
 
 import asyncio
+import hashlib
 import json
 import re
-from datetime import datetime
-from typing import Optional, Dict, Any
+import time
+from functools import lru_cache
+from itertools import islice
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 from loguru import logger
 
 from config import settings
 from database import db
-from discord_client import DiscordClient
+from discord_client import discord_client
 from build_agent_enhanced import enhanced_build_agent
 from urgent_notifier import UrgentNotifier
 from models import Tweet
+from text_utils import truncate
+
+# Optional: pyahocorasick matches every action keyword in one pass over the reply
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Optional: redis-py mirrors pending tweets (with native TTL) so they survive restarts
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Reply keywords per action, highest priority first (whole-word match)
+ACTION_KEYWORDS = (
+    ("INTERESTING", frozenset({"INTERESTING", "YES", "SEND", "1", "DISCORD"})),
+    ("NOTHING", frozenset({"NOTHING", "NO", "SKIP", "IGNORE", "2", "BAD", "TRASH"})),
+    ("BUILD", frozenset({"BUILD", "CREATE", "MAKE", "PROJECT", "3", "REPO"})),
+)
+_TOKEN_RE = re.compile(r"[A-Z0-9]+")
+
+
+def _build_action_automaton():
+    """Aho-Corasick automaton mapping each keyword to (priority, action, length)."""
+    automaton = ahocorasick.Automaton()
+    for priority, (action, keywords) in enumerate(ACTION_KEYWORDS):
+        for keyword in keywords:
+            automaton.add_word(keyword, (priority, action, len(keyword)))
+    automaton.make_automaton()
+    return automaton
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same character class as _TOKEN_RE."""
+    return "A" <= ch <= "Z" or "0" <= ch <= "9"
+
+
+def _token_action(reply: str) -> str:
+    """Whole-token lookup over ACTION_KEYWORDS in priority order (fallback without the automaton)."""
+    tokens = set(_TOKEN_RE.findall(reply))
+    for action, keywords in ACTION_KEYWORDS:
+        if not tokens.isdisjoint(keywords):
+            return action
+    return "UNKNOWN"
+
+
+# Replies that are exactly one keyword ("1", "YES", "BUILD"...)
+EXACT_ACTIONS = {
+    keyword: action
+    for action, keywords in ACTION_KEYWORDS
+    for keyword in keywords
+}
+# Quick-reply letters offered in the alert ("Or: I / N / B") - exact match only
+EXACT_ACTIONS.update({"I": "INTERESTING", "N": "NOTHING", "B": "BUILD"})
+
+# Built once, shared by all handlers
+ACTION_AUTOMATON = _build_action_automaton() if AHOCORASICK_AVAILABLE else None
+
+
+@lru_cache(maxsize=256)
+def _match_action(reply: str) -> str:
+    """Action for a raw reply (replies repeat a lot, so memoized - a hit skips normalizing too)."""
+    reply = reply.strip().upper()
+    
+    # Fast path: the reply is just one of the prompt's keywords
+    action = EXACT_ACTIONS.get(reply)
+    if action is not None:
+        return action
+    
+    if ACTION_AUTOMATON is None:
+        return _token_action(reply)
+    
+    # Single pass: keep the highest-priority hit that is a whole word
+    # ("10" is not "1", "KNOW" is not "NO")
+    best = None
+    for end, hit in ACTION_AUTOMATON.iter(reply):
+        start = end - hit[2] + 1
+        if start > 0 and _is_word_char(reply[start - 1]):
+            continue
+        if end + 1 < len(reply) and _is_word_char(reply[end + 1]):
+            continue
+        if hit[0] == 0:
+            return hit[1]
+        if best is None or hit < best:
+            best = hit
+    return best[1] if best else "UNKNOWN"
+
+
+# Fixed reply texts
+_UNKNOWN_REPLY = """❓ Unknown reply.
+
+Please respond with:
+1️⃣ *INTERESTING* - Send to Discord
+2️⃣ *NOTHING* - Filter this tweet  
+3️⃣ *BUILD* - Create project from this idea"""
+_NO_PENDING = "❌ No pending tweet found. You may have already responded or the tweet expired."
+_DISCORD_NOT_CONFIGURED = "❌ INTERESTING channel not configured. Please add DISCORD_WEBHOOK_INTERESTING env var."
+_DISCORD_SEND_FAILED = "❌ Failed to send to Discord. Please try again."
+_NOTED = "✅ Noted. I'll learn from this and improve my scoring."
+_SLOW_DOWN = "⏱️ Slow down - too many replies. Try again in a minute."
+
+
+# Identical BUILD requests (retweets, reposts) reuse the earlier result
+BUILD_CACHE_TTL = 7 * 24 * 3600  # seconds
+_URL_RE = re.compile(r"https?://\S+")
+
+
+def _build_cache_key(text: str) -> str:
+    """SHA-256 of the tweet text without URLs, case or extra whitespace."""
+    normalized = " ".join(_URL_RE.sub(" ", text).lower().split())
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+# Tweet/error text shown in WhatsApp messages and stored in user_actions
+PREVIEW_LEN = 200
+
+
+# User actions are queued and written in batches by a background task
+USER_ACTION_BATCH_SIZE = 32
+USER_ACTION_BATCH_WINDOW = 0.1  # seconds
+_log_queue: asyncio.Queue = asyncio.Queue(maxsize=1024)
+_log_writer: Optional[asyncio.Task] = None
+
+
+def log_user_action(**row) -> None:
+    """Queue a user action for the batched DB writer (never blocks the caller)."""
+    global _log_writer
+    
+    if _log_writer is None or _log_writer.done():
+        _log_writer = asyncio.create_task(_run_log_writer())
+    
+    try:
+        _log_queue.put_nowait(row)
+    except asyncio.QueueFull:
+        logger.warning(f"User action queue full, dropping {row.get('action')} from {row.get('phone')}")
+
+
+async def _run_log_writer() -> None:
+    """Drain the user action queue into db.log_user_actions_bulk."""
+    while True:
+        batch = [await _log_queue.get()]
+        
+        try:
+            await asyncio.sleep(USER_ACTION_BATCH_WINDOW)
+            while len(batch) < USER_ACTION_BATCH_SIZE and not _log_queue.empty():
+                batch.append(_log_queue.get_nowait())
+        finally:
+            # Also runs when cancelled on shutdown - don't lose rows already dequeued
+            try:
+                await db.log_user_actions_bulk(batch)
+            except Exception as e:
+                logger.error(f"Failed to log {len(batch)} user action(s): {e}")
+
+
+async def flush_user_actions() -> None:
+    """Stop the writer and save whatever is still queued (call on shutdown)."""
+    global _log_writer
+    
+    if _log_writer is not None:
+        _log_writer.cancel()
+        await asyncio.gather(_log_writer, return_exceptions=True)
+        _log_writer = None
+    
+    batch = []
+    while not _log_queue.empty():
+        batch.append(_log_queue.get_nowait())
+    if batch:
+        await db.log_user_actions_bulk(batch)
+
+
+@dataclass(slots=True)
+class PendingTweet:
+    """A tweet waiting for the user's WhatsApp reply."""
+    username: str
+    tweet: Tweet
+    rating: dict
+    sent_at_ns: int  # time.monotonic_ns()
+    status: str = "pending"
 
 
 class WhatsAppActionHandler:
@@ -34,149 +221,341 @@ class WhatsAppActionHandler:
     4. Executes the requested action
     """
     
+    # Minimum gap between BUILD progress messages (WhatsApp rate limits)
+    PROGRESS_MIN_INTERVAL = 5.0  # seconds
+    
+    # Redis key prefix for mirrored pending tweets
+    REDIS_PREFIX = "pending:"
+    
+    # Processed WhatsApp message IDs remembered for redelivery dedup
+    SEEN_IDS_MAX = 10_000
+    
+    # Per-phone token bucket for incoming replies (floods never reach the handlers)
+    REPLY_BURST = 5.0  # tokens
+    REPLY_RATE_PER_MIN = 5.0  # tokens refilled per minute
+    
+    # Background expiry of unanswered tweets
+    SWEEP_INTERVAL = 30  # seconds
+    PENDING_MAX_AGE_MINUTES = 60
+    
+    # How long shutdown waits for running reply actions before cancelling them
+    SHUTDOWN_DRAIN_TIMEOUT = 20  # seconds
+    
     def __init__(self):
-        self.pending_tweets: Dict[str, Dict[str, Any]] = {}  # phone -> tweet data
-        self.discord = DiscordClient()
+        # phone -> PendingTweet, oldest first (expiry pops from the front)
+        self.pending_tweets: "OrderedDict[str, PendingTweet]" = OrderedDict()
+        self._sweeper: Optional[asyncio.Task] = None
+        self.evicted_count = 0  # Pending tweets dropped by the MAX_PENDING_TWEETS cap
+        self._action_tasks: Set[asyncio.Task] = set()  # Replies running in the background
+        self._seen_ids: "OrderedDict[str, None]" = OrderedDict()  # Recent message IDs, oldest first
+        self._locks: Dict[str, List] = {}  # phone -> [Lock, holders + waiters], see _phone_lock
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # phone -> (tokens, last refill monotonic)
+        
+        # Redis mirror of pending_tweets (memory stays the source of truth while running)
+        self._redis = (
+            aioredis.from_url(settings.REDIS_URL)
+            if REDIS_AVAILABLE and settings.REDIS_URL else None
+        )
+        self._redis_writes: Set[asyncio.Task] = set()
+    
+    async def start(self):
+        """Restore mirrored pending tweets and start the background sweeper (idempotent - safe across reloads)."""
+        if self._redis is not None:
+            await self._restore_pending()
+        
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+    
+    async def shutdown(self):
+        """Stop the background sweeper, then drain reply actions (cancelling any that overrun)."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        
+        if self._action_tasks:
+            _, overrun = await asyncio.wait(set(self._action_tasks), timeout=self.SHUTDOWN_DRAIN_TIMEOUT)
+            # Cancelled actions put their tweet back (see _run_action), so the mirror below keeps it
+            for task in overrun:
+                task.cancel()
+            await asyncio.gather(*overrun, return_exceptions=True)
+            if overrun:
+                logger.warning(f"Cancelled {len(overrun)} reply action(s) still running at shutdown")
+        
+        # Let queued Redis writes land before closing the pool
+        if self._redis is not None:
+            await asyncio.gather(*self._redis_writes, return_exceptions=True)
+            await self._redis.aclose()
+    
+    async def _sweep_loop(self):
+        """Expire unanswered tweets every SWEEP_INTERVAL seconds."""
+        while True:
+            await asyncio.sleep(self.SWEEP_INTERVAL)
+            try:
+                self.cleanup_expired(self.PENDING_MAX_AGE_MINUTES)
+                self._prune_buckets()
+            except Exception as e:
+                logger.error(f"Pending tweet sweep failed: {e}")
     
     def store_pending_tweet(self, phone: str, username: str, tweet: Tweet, rating: dict):
         """Store tweet info while waiting for user reply."""
-        self.pending_tweets[phone] = {
-            "username": username,
-            "tweet": tweet,
-            "rating": rating,
-            "sent_at": datetime.now(),
-            "status": "pending"
-        }
+        self.pending_tweets[phone] = PendingTweet(username, tweet, rating, time.monotonic_ns())
+        self.pending_tweets.move_to_end(phone)
+        
+        # Hard cap - evict the oldest unanswered tweets
+        while len(self.pending_tweets) > settings.MAX_PENDING_TWEETS:
+            evicted_phone, _ = self.pending_tweets.popitem(last=False)
+            self._mirror_delete(evicted_phone)
+            self.evicted_count += 1
+            logger.warning(f"Evicted pending tweet for {evicted_phone} (MAX_PENDING_TWEETS={settings.MAX_PENDING_TWEETS})")
+        self._mirror_store(phone, self.pending_tweets[phone])
         logger.info(f"Stored pending tweet for {phone}: @{username}")
     
-    async def process_reply(self, phone: str, reply_text: str) -> str:
-        """
-        Process user's WhatsApp reply.
+    def _mirror_store(self, phone: str, pending: PendingTweet) -> None:
+        """Write a pending tweet to Redis in the background (expires with PENDING_MAX_AGE_MINUTES)."""
+        if self._redis is None:
+            return
+        value = json.dumps({
+            "username": pending.username,
+            "tweet": pending.tweet.model_dump(mode="json"),
+            "rating": pending.rating,
+        })
+        self._redis_write(self._redis.set(
+            self.REDIS_PREFIX + phone, value, ex=self.PENDING_MAX_AGE_MINUTES * 60
+        ))
+    
+    def _mirror_delete(self, phone: str) -> None:
+        """Drop a pending tweet from Redis in the background."""
+        if self._redis is not None:
+            self._redis_write(self._redis.delete(self.REDIS_PREFIX + phone))
+    
+    def _redis_write(self, command: Awaitable) -> None:
+        """Run a Redis command without blocking the caller (errors are only logged)."""
+        async def run():
+            try:
+                await command
+            except Exception as e:
+                logger.warning(f"Redis pending-tweet mirror failed: {e}")
+        
+        task = asyncio.create_task(run())
+        self._redis_writes.add(task)
+        task.add_done_callback(self._redis_writes.discard)
+    
+    async def _restore_pending(self) -> None:
+        """Load pending tweets mirrored by a previous run, keeping their remaining TTL."""
+        max_age_ns = self.PENDING_MAX_AGE_MINUTES * 60_000_000_000
+        restored = []
         
-        Returns confirmation message to send back.
+        try:
+            async for key in self._redis.scan_iter(match=self.REDIS_PREFIX + "*"):
+                raw, ttl = await asyncio.gather(self._redis.get(key), self._redis.ttl(key))
+                if raw is None or ttl <= 0:
+                    continue
+                data = json.loads(raw)
+                phone = key.decode()[len(self.REDIS_PREFIX):]
+                sent_at_ns = time.monotonic_ns() - max_age_ns + ttl * 1_000_000_000
+                restored.append((sent_at_ns, phone, PendingTweet(
+                    data["username"], Tweet(**data["tweet"]), data["rating"], sent_at_ns
+                )))
+        except Exception as e:
+            logger.warning(f"Could not restore pending tweets from Redis: {e}")
+            return
+        
+        # Oldest first, so the expiry sweep can keep popping from the front
+        for _, phone, pending in sorted(restored, key=lambda item: item[0]):
+            if phone not in self.pending_tweets:
+                self.pending_tweets[phone] = pending
+        if restored:
+            logger.info(f"Restored {len(restored)} pending tweet(s) from Redis")
+    
+    async def enqueue_reply(self, phone: str, reply_text: str, message_id: Optional[str] = None) -> str:
         """
-        reply = reply_text.strip().upper()
+        Webhook fast path: claim the pending tweet and run the action in the background.
         
-        # Check if we have a pending tweet for this phone
-        if phone not in self.pending_tweets:
-            return "❌ No pending tweet found. You may have already responded or the tweet expired."
+        Returns an immediate ACK ("" for a redelivered message_id); the outcome
+        follows as a separate WhatsApp message.
+        """
+        action, pending = self._claim_reply(phone, reply_text, message_id)
+        if pending is None:
+            return action
         
-        pending = self.pending_tweets[phone]
-        username = pending["username"]
-        tweet = pending["tweet"]
-        rating = pending["rating"]
+        task = asyncio.create_task(self._run_action(action, phone, pending))
+        self._action_tasks.add(task)
+        task.add_done_callback(self._action_tasks.discard)
         
-        # Parse action from reply
-        action = self._parse_action(reply)
+        return self.ACTION_ACKS[action]
+    
+    def _claim_reply(
+        self,
+        phone: str,
+        reply_text: str,
+        message_id: Optional[str] = None
+    ) -> Tuple[str, Optional[PendingTweet]]:
+        """
+        Parse the reply and take its pending tweet.
         
-        if action == "INTERESTING":
-            return await self._handle_interesting(phone, username, tweet, rating)
+        Returns (action, pending), or (message for the user, None) if there is nothing to run.
+        """
+        # WhatsApp delivers at least once - answer each message ID only the first time
+        if message_id and self._is_duplicate(message_id):
+            logger.info(f"Ignoring redelivered WhatsApp message {message_id} from {phone}")
+            return "", None
         
-        elif action == "NOTHING":
-            return await self._handle_nothing(phone, username, tweet, rating)
+        if not self._take_token(phone):
+            logger.warning(f"Rate limited WhatsApp replies from {phone}")
+            return _SLOW_DOWN, None
         
-        elif action == "BUILD":
-            return await self._handle_build(phone, username, tweet, rating)
+        # Check if we have a pending tweet for this phone
+        if phone not in self.pending_tweets:
+            return _NO_PENDING, None
         
-        else:
-            # Unknown action - ask again
-            return """❓ Unknown reply.
-
-Please respond with:
-1️⃣ *INTERESTING* - Send to Discord
-2️⃣ *NOTHING* - Filter this tweet  
-3️⃣ *BUILD* - Create project from this idea"""
-    
-    def _parse_action(self, reply: str) -> str:
-        """Parse action from user reply."""
-        reply = reply.strip().upper()
+        action = self._parse_action(reply_text)
+        if action not in self.ACTION_HANDLERS:
+            # Unknown action - ask again (tweet stays pending)
+            return _UNKNOWN_REPLY, None
         
-        # INTERESTING variants
-        if any(x in reply for x in ["INTERESTING", "YES", "SEND", "1", "DISCORD"]):
-            return "INTERESTING"
+        # pop() so a duplicate delivery of the same reply can't run the action twice
+        pending = self.pending_tweets.pop(phone, None)
+        if pending is None:
+            return _NO_PENDING, None
+        self._mirror_delete(phone)
         
-        # NOTHING variants  
-        if any(x in reply for x in ["NOTHING", "NO", "SKIP", "IGNORE", "2", "BAD", "TRASH"]):
-            return "NOTHING"
+        return action, pending
+    
+    def _take_token(self, phone: str) -> bool:
+        """Token bucket: True if phone may send another reply now."""
+        now = time.monotonic()
+        tokens, last = self._buckets.get(phone, (self.REPLY_BURST, now))
+        tokens = min(self.REPLY_BURST, tokens + (now - last) * self.REPLY_RATE_PER_MIN / 60)
+        if tokens < 1:
+            self._buckets[phone] = (tokens, now)
+            return False
+        self._buckets[phone] = (tokens - 1, now)
+        return True
+    
+    def _prune_buckets(self) -> None:
+        """Forget buckets that have refilled completely (same as a fresh one)."""
+        now = time.monotonic()
+        refill_secs = self.REPLY_BURST * 60 / self.REPLY_RATE_PER_MIN
+        self._buckets = {
+            phone: (tokens, last)
+            for phone, (tokens, last) in self._buckets.items()
+            if now - last < refill_secs
+        }
+    
+    def _is_duplicate(self, message_id: str) -> bool:
+        """True if message_id was already seen; otherwise remember it (bounded LRU)."""
+        if message_id in self._seen_ids:
+            return True
+        self._seen_ids[message_id] = None
+        if len(self._seen_ids) > self.SEEN_IDS_MAX:
+            self._seen_ids.popitem(last=False)
+        return False
+    
+    async def _run_action(self, action: str, phone: str, pending: PendingTweet) -> None:
+        """Background half of enqueue_reply: run the handler and report its result over WhatsApp."""
+        try:
+            async with self._phone_lock(phone):
+                result = await self.ACTION_HANDLERS[action](
+                    self, self._log_ctx(phone, pending), pending.tweet, pending.rating
+                )
+                
+                if action not in self.SILENT_ACTIONS:
+                    await UrgentNotifier()._send_whatsapp_raw(
+                        to=settings.YOUR_PHONE_NUMBER,
+                        message=result
+                    )
         
-        # BUILD variants
-        if any(x in reply for x in ["BUILD", "CREATE", "MAKE", "PROJECT", "3", "REPO"]):
-            return "BUILD"
+        except asyncio.CancelledError:
+            # Shutdown overran the drain: keep the claimed tweet so the reply isn't lost
+            self._release(self._log_ctx(phone, pending), pending.tweet, pending.rating)
+            raise
         
-        return "UNKNOWN"
+        except Exception:
+            logger.exception(f"{action} for @{pending.username} failed")
+    
+    @staticmethod
+    def _log_ctx(phone: str, pending: PendingTweet) -> Dict[str, str]:
+        """Per-reply fields shared by every user_actions row (text truncated once here)."""
+        return {
+            "phone": phone,
+            "username": pending.username,
+            "tweet_id": pending.tweet.id,
+            "tweet_text": truncate(pending.tweet.text, PREVIEW_LEN),
+        }
+    
+    @asynccontextmanager
+    async def _phone_lock(self, phone: str) -> AsyncIterator[None]:
+        """One action at a time per phone; the lock is dropped once nobody holds or awaits it."""
+        entry = self._locks.get(phone)
+        if entry is None:
+            entry = self._locks[phone] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[phone]
+    
+    def _parse_action(self, reply: str) -> str:
+        """Parse action from user reply (raw text - normalized once, inside the cache)."""
+        return _match_action(reply)
     
     async def _handle_interesting(
         self, 
-        phone: str, 
-        username: str, 
+        log_ctx: Dict[str, str], 
         tweet: Tweet, 
         rating: dict
     ) -> str:
         """Send tweet to INTERESTING Discord channel."""
+        username = log_ctx["username"]
         webhook = settings.DISCORD_WEBHOOK_INTERESTING
         
         if not webhook:
             logger.error("INTERESTING webhook not configured")
-            return "❌ INTERESTING channel not configured. Please add DISCORD_WEBHOOK_INTERESTING env var."
+            return _DISCORD_NOT_CONFIGURED
         
         try:
-            async with self.discord:
-                success = await self.discord.send_tweet(webhook, username, tweet)
+            success = await discord_client.send_tweet(webhook, username, tweet)
             
             if success:
-                # Log to database
-                db.log_user_action(
-                    phone=phone,
-                    action="INTERESTING",
-                    username=username,
-                    tweet_id=tweet.id,
-                    tweet_text=tweet.text[:200]
-                )
-                
-                # Remove from pending
-                del self.pending_tweets[phone]
+                self._complete("INTERESTING", log_ctx)
                 
                 return f"✅ Sent to INTERESTING channel!\n\n@{username}'s tweet has been shared."
             else:
-                return "❌ Failed to send to Discord. Please try again."
+                self._release(log_ctx, tweet, rating)
+                return _DISCORD_SEND_FAILED
                 
         except Exception as e:
             logger.error(f"Error sending to INTERESTING: {e}")
+            self._release(log_ctx, tweet, rating)
             return f"❌ Error: {str(e)}"
     
     async def _handle_nothing(
         self, 
-        phone: str, 
-        username: str, 
+        log_ctx: Dict[str, str], 
         tweet: Tweet, 
         rating: dict
     ) -> str:
         """Mark tweet as filtered - AI thought it was urgent but user disagrees."""
         # Log for AI learning
-        db.log_user_action(
-            phone=phone,
-            action="FILTERED",
-            username=username,
-            tweet_id=tweet.id,
-            tweet_text=tweet.text[:200],
+        # Update AI model feedback (future enhancement)
+        # This helps the AI learn what the user actually finds valuable
+        self._complete(
+            "FILTERED", log_ctx,
             ai_score=rating.get("score", 0),
             reason="User marked as not interesting"
         )
         
-        # Update AI model feedback (future enhancement)
-        # This helps the AI learn what the user actually finds valuable
-        
-        # Remove from pending
-        del self.pending_tweets[phone]
-        
-        logger.info(f"User {phone} filtered tweet from @{username}")
+        logger.info(f"User {log_ctx['phone']} filtered tweet from @{log_ctx['username']}")
         
-        return "✅ Noted. I'll learn from this and improve my scoring."
+        return _NOTED
     
     async def _handle_build(
         self, 
-        phone: str, 
-        username: str, 
+        log_ctx: Dict[str, str], 
         tweet: Tweet, 
         rating: dict
     ) -> str:
@@ -189,42 +568,42 @@ Please respond with:
         3. 🔨 GitHub - Create private repo
         """
         
-        # Send initial acknowledgment via WhatsApp
+        username = log_ctx["username"]
+        short_text = log_ctx["tweet_text"]
+        
+        # Send initial acknowledgment via WhatsApp (in the background while the build starts)
         notifier = UrgentNotifier()
-        await notifier._send_whatsapp_raw(
+        ack_task = asyncio.create_task(notifier._send_whatsapp_raw(
             to=settings.YOUR_PHONE_NUMBER,
-            message=f"🔨 *BUILD STARTED*\n\nTweet from @{username}:\n{tweet.text[:200]}...\n\n🧠 Kimi K2: Analyzing...\n💻 Qwen Coder: Ready to build\n\nThis takes ~2-3 minutes. I'll update you on progress!"
-        )
+            message=f"🔨 *BUILD STARTED*\n\nTweet from @{username}:\n{short_text}\n\n🧠 Kimi K2: Analyzing...\n💻 Qwen Coder: Ready to build\n\nThis takes ~2-3 minutes. I'll update you on progress!"
+        ))
         
         try:
             # Run full build pipeline with Kimi + Qwen
             logger.info(f"Starting BUILD for @{username} with Kimi+Qwen")
             
-            result = await enhanced_build_agent.build_project(
-                tweet_text=tweet.text,
-                username=username
-            )
+            cache_key = _build_cache_key(tweet.text)
+            result = await self._get_cached_build(cache_key)
+            
+            if result is None:
+                result = await enhanced_build_agent.build_project(
+                    tweet_text=tweet.text,
+                    username=username,
+                    on_progress=self._progress_sender(notifier)
+                )
+                if result["success"]:
+                    await self._save_cached_build(cache_key, result)
+            else:
+                logger.info(f"♻️ Reusing cached build for @{username}: {result['project_name']}")
+            
+            # Ack must land before the result message
+            await self._await_ack(ack_task)
             
             if result["success"]:
                 # Build completed successfully!
                 project_name = result["project_name"]
                 github_url = f"https://github.com/{settings.GITHUB_USERNAME}/{project_name}"
                 
-                # ALSO send original tweet to INTERESTING channel
-                webhook = settings.DISCORD_WEBHOOK_INTERESTING
-                if webhook:
-                    try:
-                        async with self.discord:
-                            await self.discord.send_tweet(
-                                webhook, 
-                                username, 
-                                tweet,
-                                note=f"🚀 Built into project: [{project_name}]({github_url})"
-                            )
-                        logger.info(f"Sent built tweet to INTERESTING channel: {project_name}")
-                    except Exception as e:
-                        logger.error(f"Failed to send to INTERESTING: {e}")
-                
                 # Send success message with repo link
                 success_msg = f"""✅ *BUILD COMPLETE!*
 
@@ -247,21 +626,26 @@ Please respond with:
 
 Built with 🤖 Kimi + Qwen (40x cheaper than GPT-4o!)"""
                 
-                await notifier._send_whatsapp_raw(
-                    to=settings.YOUR_PHONE_NUMBER,
-                    message=success_msg
-                )
-                
                 # Log success
-                db.log_user_action(
-                    phone=phone,
-                    action="BUILD_COMPLETED",
-                    username=username,
-                    tweet_id=tweet.id,
+                self._complete(
+                    "BUILD_COMPLETED", log_ctx,
                     project_name=project_name,
                     reason=f"Kimi+Qwen build successful. Score: {result['stats']['review_score']}/10"
                 )
                 
+                # Discord post and success message are independent - run together
+                results = await asyncio.gather(
+                    self._send_built_to_interesting(username, tweet, project_name, github_url),
+                    notifier._send_whatsapp_raw(
+                        to=settings.YOUR_PHONE_NUMBER,
+                        message=success_msg
+                    ),
+                    return_exceptions=True
+                )
+                for step, outcome in zip(("Send to INTERESTING", "Success message"), results):
+                    if isinstance(outcome, Exception):
+                        logger.error(f"{step} failed: {outcome}")
+                
             else:
                 # Build failed
                 error_msg = f"""❌ *BUILD FAILED*
@@ -277,40 +661,135 @@ Try replying BUILD to a different tweet!"""
                     message=error_msg
                 )
             
-            # Remove from pending
-            del self.pending_tweets[phone]
-            
             return "Build process completed! Check WhatsApp for details."
+        
+        except asyncio.CancelledError:
+            # Don't leave the BUILD STARTED send running on its own
+            ack_task.cancel()
+            raise
             
         except Exception as e:
             logger.error(f"Build failed: {e}")
             import traceback
             logger.error(traceback.format_exc())
             
+            err_short = truncate(str(e), PREVIEW_LEN)
+            await self._await_ack(ack_task)
             await notifier._send_whatsapp_raw(
                 to=settings.YOUR_PHONE_NUMBER,
-                message=f"❌ *BUILD ERROR*\n\nSomething went wrong:\n{str(e)[:200]}\n\nPlease try again with a different tweet."
+                message=f"❌ *BUILD ERROR*\n\nSomething went wrong:\n{err_short}\n\nPlease try again with a different tweet."
             )
             
-            return f"❌ Build failed: {str(e)[:100]}"
+            return f"❌ Build failed: {truncate(err_short, 100)}"
+    
+    def _complete(self, db_action: str, log_ctx: Dict[str, str], **extra) -> None:
+        """Shared tail of every action: queue the user_actions row."""
+        log_user_action(action=db_action, **log_ctx, **extra)
+    
+    def _release(self, log_ctx: Dict[str, str], tweet: Tweet, rating: dict) -> None:
+        """Put a claimed tweet back after a failed action so the user can retry (unless a newer one arrived)."""
+        if log_ctx["phone"] not in self.pending_tweets:
+            self.store_pending_tweet(log_ctx["phone"], log_ctx["username"], tweet, rating)
+    
+    def _progress_sender(self, notifier: UrgentNotifier) -> Callable[[str, str], Awaitable[None]]:
+        """build_project progress callback: short WhatsApp updates, at most one per PROGRESS_MIN_INTERVAL."""
+        last_sent = time.monotonic()  # the BUILD STARTED ack counts as the first message
+        
+        async def send(stage: str, message: str) -> None:
+            nonlocal last_sent
+            now = time.monotonic()
+            if now - last_sent < self.PROGRESS_MIN_INTERVAL:
+                return
+            last_sent = now
+            await notifier._send_whatsapp_raw(to=settings.YOUR_PHONE_NUMBER, message=f"🔨 {message}")
+        
+        return send
+    
+    async def _get_cached_build(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Earlier successful build for the same tweet text, if any (cache errors = miss)."""
+        try:
+            return await db.get_cached_build(cache_key, BUILD_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"Build cache lookup failed: {e}")
+            return None
+    
+    async def _save_cached_build(self, cache_key: str, result: Dict[str, Any]) -> None:
+        """Remember a successful build result."""
+        try:
+            await db.save_cached_build(cache_key, result)
+        except Exception as e:
+            logger.warning(f"Failed to cache build result: {e}")
+    
+    async def _await_ack(self, ack_task: asyncio.Task) -> None:
+        """Wait for the BUILD STARTED message, logging (not raising) a failed send."""
+        try:
+            await ack_task
+        except Exception as e:
+            logger.error(f"Failed to send BUILD STARTED message: {e}")
+    
+    async def _send_built_to_interesting(
+        self,
+        username: str,
+        tweet: Tweet,
+        project_name: str,
+        github_url: str
+    ) -> None:
+        """ALSO send the original tweet to the INTERESTING channel."""
+        webhook = settings.DISCORD_WEBHOOK_INTERESTING
+        if not webhook:
+            return
+        
+        await discord_client.send_tweet(
+            webhook, 
+            username, 
+            tweet,
+            note=f"🚀 Built into project: [{project_name}]({github_url})"
+        )
+        logger.info(f"Sent built tweet to INTERESTING channel: {project_name}")
+    
+    # Reply action -> handler (called as handler(self, log_ctx, tweet, rating))
+    ACTION_HANDLERS = {
+        "INTERESTING": _handle_interesting,
+        "NOTHING": _handle_nothing,
+        "BUILD": _handle_build,
+    }
+    
+    # Immediate webhook reply for enqueue_reply (the real result follows on WhatsApp)
+    ACTION_ACKS = {
+        "INTERESTING": "⏳ Sending to INTERESTING channel...",
+        "NOTHING": _NOTED,
+        "BUILD": "🔨 Build queued! Progress updates will follow on WhatsApp.",
+    }
+    
+    # No follow-up message: the ACK already says it all (NOTHING) or the handler messages the user (BUILD)
+    SILENT_ACTIONS = frozenset({"NOTHING", "BUILD"})
     
     def get_pending_count(self) -> int:
         """Get number of pending tweets awaiting user response."""
         return len(self.pending_tweets)
     
-    def cleanup_expired(self, max_age_minutes: int = 60):
-        """Remove expired pending tweets."""
-        now = datetime.now()
+    def cleanup_expired(self, max_age_minutes: int = PENDING_MAX_AGE_MINUTES) -> int:
+        """Remove expired pending tweets, returning how many were dropped."""
+        cutoff = time.monotonic_ns() - max_age_minutes * 60_000_000_000
+        pending = self.pending_tweets
         expired = []
         
-        for phone, data in self.pending_tweets.items():
-            age = (now - data["sent_at"]).total_seconds() / 60
-            if age > max_age_minutes:
-                expired.append(phone)
+        # Ordered by sent time (every store moves to the end), so the dict is its
+        # own expiry index: pop from the front until the first fresh entry - O(k)
+        for phone, data in pending.items():
+            if data.sent_at_ns >= cutoff:
+                break
+            expired.append(phone)
+        if len(expired) > len(pending) // 4:
+            # Mass expiry (e.g. after a quiet night): one new table beats many deletes
+            self.pending_tweets = OrderedDict(islice(pending.items(), len(expired), None))
+        else:
+            for phone in expired:
+                del pending[phone]
         
-        for phone in expired:
-            del self.pending_tweets[phone]
-            logger.info(f"Cleaned up expired pending tweet for {phone}")
+        if expired:
+            logger.info(f"Cleaned up {len(expired)} expired pending tweet(s): {', '.join(expired)}")
+        return len(expired)
 
 
 # Singleton